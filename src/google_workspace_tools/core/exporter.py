@@ -1,14 +1,18 @@
 """Google Drive document exporter."""
 
-import base64
+import copy
 import csv
 import io
 import json
 import re
+import string
+from collections import defaultdict, deque
 from collections.abc import Generator
 from datetime import UTC, datetime
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Literal, cast
+from typing import Any, Literal, TextIO, cast
 from urllib.parse import parse_qs, urlparse
 
 import google.auth.transport.requests
@@ -18,7 +22,13 @@ from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload
-from html_to_markdown import convert_to_markdown, convert_with_inline_images
+from html_to_markdown import (
+    ConversionOptions,
+    PreprocessingOptions,
+    convert_with_handle,
+    convert_with_inline_images,
+    create_options_handle,
+)
 from loguru import logger
 
 from .config import GoogleDriveExporterConfig
@@ -26,6 +36,141 @@ from .filters import CalendarEventFilter, GmailSearchFilter
 from .storage import CredentialStorage, StoredCredentials, get_credential_storage
 from .types import DocumentConfig, DocumentType, ExportFormat
 
+try:
+    # SIMD decoder from the optional "speedups" extra; same API as the stdlib function
+    from pybase64 import urlsafe_b64decode
+except ImportError:
+    from base64 import urlsafe_b64decode  # type: ignore[assignment]
+
+try:
+    # Faster JSON encoder from the optional "speedups" extra
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# Characters allowed in a Drive document ID
+_DOC_ID_CHARS = string.ascii_letters + string.digits + "-_"
+
+# URL path segments that precede ``d/<id>`` or ``u/<n>/d/<id>``, in lookup order
+_DOC_PATH_KINDS = ("/document/", "/spreadsheets/", "/presentation/")
+
+# Literal URL markers for each document type, checked in order; the first type with a match wins
+_URL_TYPE_MARKERS = (
+    (("/spreadsheets/", "sheets.google.com"), DocumentType.SPREADSHEET),
+    (("/presentation/", "slides.google.com"), DocumentType.PRESENTATION),
+    (("/document/", "docs.google.com"), DocumentType.DOCUMENT),
+)
+
+# Parsed once and reused for every email body and event description; these options reproduce
+# the html_to_markdown v1 ``convert_to_markdown()`` defaults the exported Markdown was built with
+_HTML_TO_MARKDOWN = create_options_handle(
+    ConversionOptions(
+        heading_style="underlined",
+        list_indent_width=4,
+        bullets="*+-",
+        escape_asterisks=True,
+        escape_underscores=True,
+        escape_misc=True,
+        code_block_style="indented",
+    ),
+    PreprocessingOptions(enabled=False),
+)
+
+# Frontmatter fields injected for every exported document, in output order
+_AUTO_FRONTMATTER_KEYS = ("title", "source", "synced_at")
+
+# Google Docs/Drive links in exported HTML (including wrapped redirect URLs); group 1 is the document ID
+_DRIVE_LINK_PATTERNS = tuple(
+    re.compile(pattern)
+    for pattern in (
+        # Direct Google Docs/Drive links
+        r'(?:href="|>)https://(?:docs\.google\.com/document/(?:u/\d+/)?d/|drive\.google\.com/file/d/|drive\.google\.com/open\?id=)([a-zA-Z0-9-_]+)',
+        # Direct Google Sheets links
+        r'(?:href="|>)https://(?:docs\.google\.com/spreadsheets/(?:u/\d+/)?d/|sheets\.google\.com/spreadsheets/d/)([a-zA-Z0-9-_]+)',
+        # Direct Google Slides links
+        r'(?:href="|>)https://(?:docs\.google\.com/presentation/(?:u/\d+/)?d/|slides\.google\.com/presentation/d/)([a-zA-Z0-9-_]+)',
+        # Google-wrapped redirect URLs containing docs.google.com
+        r'(?:href="|>)https://www\.google\.com/url\?q=https://docs\.google\.com/document/(?:u/\d+/)?d/([a-zA-Z0-9-_]+)',
+        # Google-wrapped redirect URLs containing sheets
+        r'(?:href="|>)https://www\.google\.com/url\?q=https://docs\.google\.com/spreadsheets/(?:u/\d+/)?d/([a-zA-Z0-9-_]+)',
+        # Google-wrapped redirect URLs containing slides
+        r'(?:href="|>)https://www\.google\.com/url\?q=https://docs\.google\.com/presentation/(?:u/\d+/)?d/([a-zA-Z0-9-_]+)',
+        # Google-wrapped redirect URLs with drive.google.com
+        r'(?:href="|>)https://www\.google\.com/url\?q=https://drive\.google\.com/(?:file/d/|open\?id=)([a-zA-Z0-9-_]+)',
+    )
+)
+
+# Characters replaced with "_" when turning document titles into file names
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\s-]")
+
+# Characters replaced with "_" in email subjects and event summaries used in file names
+_UNSAFE_SUBJECT_CHARS = re.compile(r"[^\w -]")
+
+
+@lru_cache(maxsize=64)
+def _classify_mime(mime_type: str) -> Literal["plain", "html", "multipart", "other"]:
+    """Classify a Gmail part MIME type for body extraction; Gmail uses a small, repetitive set of types."""
+    if mime_type == "text/plain":
+        return "plain"
+    if mime_type == "text/html":
+        return "html"
+    if mime_type.startswith("multipart/"):
+        return "multipart"
+    return "other"
+
+
+def _dump_json_text(data: Any) -> str:
+    """Serialize ``data`` as indented, non-ASCII-escaping JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return cast(str, orjson.dumps(data, option=orjson.OPT_INDENT_2).decode())
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
+def _format_size(num_bytes: int) -> str:
+    """Format a byte count with a binary unit, e.g. ``512 B`` or ``10.0 KB``."""
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    # Each unit step is 10 bits, so the bit length picks the unit without a loop or log()
+    unit = min((num_bytes.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+    return f"{num_bytes / (1 << (unit * 10)):.1f} {_SIZE_UNITS[unit]}"
+
+
+def _scan_id_run(text: str, start: int) -> str:
+    """Return the run of document ID characters in ``text`` beginning at ``start``."""
+    tail = text[start:]
+    return tail[: len(tail) - len(tail.lstrip(_DOC_ID_CHARS))]
+
+
+def _scan_id_after(text: str, marker: str) -> str | None:
+    """Return the ID following the first occurrence of ``marker`` that is followed by one."""
+    pos = text.find(marker)
+    while pos >= 0:
+        doc_id = _scan_id_run(text, pos + len(marker))
+        if doc_id:
+            return doc_id
+        pos = text.find(marker, pos + 1)
+    return None
+
+
+def _scan_user_scoped_id(text: str, kind: str) -> str | None:
+    """Return the ID from a ``<kind>u/<n>/d/<id>`` path, e.g. ``/document/u/0/d/<id>``."""
+    marker = f"{kind}u/"
+    pos = text.find(marker)
+    while pos >= 0:
+        start = pos + len(marker)
+        end = start
+        while end < len(text) and text[end].isdecimal():
+            end += 1
+        if end > start and text.startswith("/d/", end):
+            doc_id = _scan_id_run(text, end + 3)
+            if doc_id:
+                return doc_id
+        pos = text.find(marker, pos + 1)
+    return None
+
 
 class GoogleDriveExporter:
     """Export Google Drive documents in various formats with link following capabilities."""
@@ -124,9 +269,15 @@ class GoogleDriveExporter:
         """
         self.config = config or GoogleDriveExporterConfig()
         self._service = None
-        self._processed_docs: set[str] = set()
+        self._processed_docs: dict[str, None] = {}  # insertion-ordered set of exported IDs
         self.download_callback = download_callback
 
+        # Custom frontmatter cache, rebuilt by _refresh_custom_frontmatter() when the config's fields change
+        self._frontmatter_fields_snapshot: dict[str, Any] = {}
+        self._frontmatter_overrides: dict[str, Any] = {}
+        self._custom_frontmatter_yaml = ""
+        self._refresh_custom_frontmatter()
+
     @property
     def service(self):
         """Get or create the Google Drive service instance."""
@@ -331,6 +482,26 @@ class GoogleDriveExporter:
             logger.error(f"Failed to get user info: {e}")
             return {}
 
+    def _refresh_custom_frontmatter(self) -> None:
+        """Re-split and re-render the custom frontmatter fields if ``config.frontmatter_fields`` changed.
+
+        Overrides of the auto-injected fields are kept as a dict; the remaining custom
+        fields are rendered to YAML once and reused until the config changes again.
+        """
+        custom_fields = self.config.frontmatter_fields
+        if custom_fields == self._frontmatter_fields_snapshot:
+            return
+        self._frontmatter_fields_snapshot = copy.deepcopy(custom_fields)
+        self._frontmatter_overrides = {
+            key: custom_fields[key] for key in _AUTO_FRONTMATTER_KEYS if key in custom_fields
+        }
+        extra_fields = {key: value for key, value in custom_fields.items() if key not in _AUTO_FRONTMATTER_KEYS}
+        self._custom_frontmatter_yaml = (
+            yaml.dump(extra_fields, default_flow_style=False, allow_unicode=True, sort_keys=False)
+            if extra_fields
+            else ""
+        )
+
     def _generate_frontmatter(self, document_id: str, title: str, source_url: str, doc_type: DocumentType) -> str:
         """Generate YAML frontmatter for markdown files.
 
@@ -350,14 +521,14 @@ class GoogleDriveExporter:
             "synced_at": datetime.now(UTC).isoformat(),
         }
 
-        # Merge with custom frontmatter fields (custom fields override auto fields)
-        if self.config.frontmatter_fields:
-            frontmatter_data.update(self.config.frontmatter_fields)
+        # Custom fields override auto fields in place; other custom fields follow, pre-rendered
+        self._refresh_custom_frontmatter()
+        frontmatter_data.update(self._frontmatter_overrides)
 
         # Generate YAML
         yaml_content = yaml.dump(frontmatter_data, default_flow_style=False, allow_unicode=True, sort_keys=False)
 
-        return f"---\n{yaml_content}---\n\n"
+        return f"---\n{yaml_content}{self._custom_frontmatter_yaml}---\n\n"
 
     def extract_document_id(self, url_or_id: str) -> str:
         """Extract document ID from URL or return the ID if already provided.
@@ -371,21 +542,14 @@ class GoogleDriveExporter:
         # If it looks like a URL
         if url_or_id.startswith(("http://", "https://")):
             # Match various Google Drive URL patterns (including tab parameters)
-            patterns = [
-                r"/document/d/([a-zA-Z0-9-_]+)",
-                r"/document/u/\d+/d/([a-zA-Z0-9-_]+)",
-                r"/spreadsheets/d/([a-zA-Z0-9-_]+)",
-                r"/spreadsheets/u/\d+/d/([a-zA-Z0-9-_]+)",
-                r"/presentation/d/([a-zA-Z0-9-_]+)",
-                r"/presentation/u/\d+/d/([a-zA-Z0-9-_]+)",
-                r"/open\?id=([a-zA-Z0-9-_]+)",
-                r"id=([a-zA-Z0-9-_]+)",
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, url_or_id)
-                if match:
-                    return match.group(1)
+            for kind in _DOC_PATH_KINDS:
+                doc_id = _scan_id_after(url_or_id, f"{kind}d/") or _scan_user_scoped_id(url_or_id, kind)
+                if doc_id:
+                    return doc_id
+
+            doc_id = _scan_id_after(url_or_id, "/open?id=") or _scan_id_after(url_or_id, "id=")
+            if doc_id:
+                return doc_id
 
             # Try parsing as URL
             parsed = urlparse(url_or_id)
@@ -412,15 +576,11 @@ class GoogleDriveExporter:
         if not url_or_id.startswith(("http://", "https://")):
             return DocumentType.UNKNOWN
 
-        # Check URL patterns
-        if "/spreadsheets/" in url_or_id or "sheets.google.com" in url_or_id:
-            return DocumentType.SPREADSHEET
-        elif "/presentation/" in url_or_id or "slides.google.com" in url_or_id:
-            return DocumentType.PRESENTATION
-        elif "/document/" in url_or_id or "docs.google.com" in url_or_id:
-            return DocumentType.DOCUMENT
-        else:
-            return DocumentType.UNKNOWN
+        for markers, doc_type in _URL_TYPE_MARKERS:
+            for marker in markers:
+                if marker in url_or_id:
+                    return doc_type
+        return DocumentType.UNKNOWN
 
     def detect_document_type_from_metadata(self, metadata: dict) -> DocumentType:
         """Detect document type from metadata mime type.
@@ -919,27 +1079,10 @@ class GoogleDriveExporter:
         Returns:
             List of Google Drive document IDs found in the content.
         """
-        # Find all Google Docs/Drive links (including wrapped redirect URLs)
-        patterns = [
-            # Direct Google Docs/Drive links
-            r'(?:href="|>)https://(?:docs\.google\.com/document/(?:u/\d+/)?d/|drive\.google\.com/file/d/|drive\.google\.com/open\?id=)([a-zA-Z0-9-_]+)',
-            # Direct Google Sheets links
-            r'(?:href="|>)https://(?:docs\.google\.com/spreadsheets/(?:u/\d+/)?d/|sheets\.google\.com/spreadsheets/d/)([a-zA-Z0-9-_]+)',
-            # Direct Google Slides links
-            r'(?:href="|>)https://(?:docs\.google\.com/presentation/(?:u/\d+/)?d/|slides\.google\.com/presentation/d/)([a-zA-Z0-9-_]+)',
-            # Google-wrapped redirect URLs containing docs.google.com
-            r'(?:href="|>)https://www\.google\.com/url\?q=https://docs\.google\.com/document/(?:u/\d+/)?d/([a-zA-Z0-9-_]+)',
-            # Google-wrapped redirect URLs containing sheets
-            r'(?:href="|>)https://www\.google\.com/url\?q=https://docs\.google\.com/spreadsheets/(?:u/\d+/)?d/([a-zA-Z0-9-_]+)',
-            # Google-wrapped redirect URLs containing slides
-            r'(?:href="|>)https://www\.google\.com/url\?q=https://docs\.google\.com/presentation/(?:u/\d+/)?d/([a-zA-Z0-9-_]+)',
-            # Google-wrapped redirect URLs with drive.google.com
-            r'(?:href="|>)https://www\.google\.com/url\?q=https://drive\.google\.com/(?:file/d/|open\?id=)([a-zA-Z0-9-_]+)',
-        ]
 
         all_matches = []
-        for pattern in patterns:
-            matches = re.findall(pattern, content)
+        for pattern in _DRIVE_LINK_PATTERNS:
+            matches = pattern.findall(content)
             all_matches.extend(matches)
 
         logger.debug(f"Found {len(all_matches)} potential Google Drive links")
@@ -1003,7 +1146,7 @@ class GoogleDriveExporter:
             logger.info(f"Found {len(sheets)} sheet(s)")
 
             # Create directory with spreadsheet name prefix
-            safe_title = re.sub(r"[^\w\s-]", "_", spreadsheet_title).strip()
+            safe_title = _UNSAFE_FILENAME_CHARS.sub("_", spreadsheet_title).strip()
             csv_dir = output_dir / f"{safe_title}_sheets"
             csv_dir.mkdir(parents=True, exist_ok=True)
 
@@ -1029,7 +1172,7 @@ class GoogleDriveExporter:
                         continue
 
                     # Sanitize filename
-                    safe_sheet_name = re.sub(r"[^\w\s-]", "_", sheet_name).strip()
+                    safe_sheet_name = _UNSAFE_FILENAME_CHARS.sub("_", sheet_name).strip()
                     csv_filename = csv_dir / f"{safe_sheet_name}.csv"
 
                     # Write CSV
@@ -1109,7 +1252,7 @@ class GoogleDriveExporter:
             # Optionally remove XLSX intermediate file
             if not self.config.keep_intermediate_xlsx:
                 logger.debug(f"Removing intermediate XLSX file: {xlsx_path}")
-                xlsx_path.unlink()
+                xlsx_path.unlink(missing_ok=True)
 
             return True
 
@@ -1162,7 +1305,7 @@ class GoogleDriveExporter:
             logger.info(f"Found {len(sheet_names)} sheet(s), exporting each as separate markdown file")
 
             # Create directory with spreadsheet name prefix
-            safe_title = re.sub(r"[^\w\s-]", "_", spreadsheet_title).strip()
+            safe_title = _UNSAFE_FILENAME_CHARS.sub("_", spreadsheet_title).strip()
             sheets_dir = output_dir / f"{safe_title}_sheets"
             sheets_dir.mkdir(parents=True, exist_ok=True)
 
@@ -1215,7 +1358,7 @@ class GoogleDriveExporter:
                         content = frontmatter + content
 
                     # Write markdown file
-                    safe_sheet_name = re.sub(r"[^\w\s-]", "_", sheet_name).strip()
+                    safe_sheet_name = _UNSAFE_FILENAME_CHARS.sub("_", sheet_name).strip()
                     md_path = sheets_dir / f"{safe_sheet_name}.md"
                     md_path.write_text(content, encoding="utf-8")
                     logger.success(f"Exported sheet '{sheet_name}' to {md_path}")
@@ -1232,7 +1375,7 @@ class GoogleDriveExporter:
             # Optionally remove XLSX intermediate file
             if not self.config.keep_intermediate_xlsx:
                 logger.debug(f"Removing intermediate XLSX file: {xlsx_path}")
-                xlsx_path.unlink()
+                xlsx_path.unlink(missing_ok=True)
 
             return exported_count > 0
 
@@ -1272,7 +1415,7 @@ class GoogleDriveExporter:
             logger.info(f"Document {document_id} already processed, skipping")
             return {}
 
-        self._processed_docs.add(document_id)
+        self._processed_docs[document_id] = None
 
         # First try to detect document type from URL
         doc_type = self.detect_document_type(original_url_or_id)
@@ -1325,7 +1468,7 @@ class GoogleDriveExporter:
             else:
                 extension = extension_map.get(mime_type, self.config.export_format)
 
-            safe_title = output_name or re.sub(r"[^\w\s-]", "_", doc_title).strip()
+            safe_title = output_name or _UNSAFE_FILENAME_CHARS.sub("_", doc_title).strip()
 
             # Determine output path
             if output_path:
@@ -1342,7 +1485,7 @@ class GoogleDriveExporter:
             else:
                 return {}
 
-        safe_title = output_name or re.sub(r"[^\w\s-]", "_", doc_title).strip()
+        safe_title = output_name or _UNSAFE_FILENAME_CHARS.sub("_", doc_title).strip()
 
         # Ensure target directory exists
         self.config.target_directory.mkdir(parents=True, exist_ok=True)
@@ -1565,37 +1708,42 @@ class GoogleDriveExporter:
         parts = [payload] if "parts" not in payload else payload.get("parts", [])
 
         # BFS traversal of message parts
-        part_queue = list(parts)
+        part_queue = deque(parts)
         while part_queue:
-            part = part_queue.pop(0)
-            mime_type = part.get("mimeType", "")
-            body_data = part.get("body", {}).get("data")
+            part = part_queue.popleft()
+            kind = _classify_mime(part.get("mimeType", ""))
+
+            # Add sub-parts to queue for multipart messages
+            if kind == "multipart":
+                part_queue.extend(part.get("parts", []))
+                continue
 
+            # Only decode text bodies that are still missing
+            if (kind == "plain" and not text_body) or (kind == "html" and not html_body):
+                body_data = part.get("body", {}).get("data")
+                if body_data:
+                    try:
+                        decoded_data = urlsafe_b64decode(body_data).decode("utf-8", errors="ignore")
+                        if kind == "plain":
+                            text_body = decoded_data
+                        else:
+                            html_body = decoded_data
+                    except Exception as e:
+                        logger.warning(f"Failed to decode body part: {e}")
+
+        # Check the main payload if it has body data directly
+        kind = _classify_mime(payload.get("mimeType", ""))
+        if (kind == "plain" and not text_body) or (kind == "html" and not html_body):
+            body_data = payload.get("body", {}).get("data")
             if body_data:
                 try:
-                    decoded_data = base64.urlsafe_b64decode(body_data).decode("utf-8", errors="ignore")
-                    if mime_type == "text/plain" and not text_body:
+                    decoded_data = urlsafe_b64decode(body_data).decode("utf-8", errors="ignore")
+                    if kind == "plain":
                         text_body = decoded_data
-                    elif mime_type == "text/html" and not html_body:
+                    else:
                         html_body = decoded_data
                 except Exception as e:
-                    logger.warning(f"Failed to decode body part: {e}")
-
-            # Add sub-parts to queue for multipart messages
-            if mime_type.startswith("multipart/") and "parts" in part:
-                part_queue.extend(part.get("parts", []))
-
-        # Check the main payload if it has body data directly
-        if payload.get("body", {}).get("data"):
-            try:
-                decoded_data = base64.urlsafe_b64decode(payload["body"]["data"]).decode("utf-8", errors="ignore")
-                mime_type = payload.get("mimeType", "")
-                if mime_type == "text/plain" and not text_body:
-                    text_body = decoded_data
-                elif mime_type == "text/html" and not html_body:
-                    html_body = decoded_data
-            except Exception as e:
-                logger.warning(f"Failed to decode main payload body: {e}")
+                    logger.warning(f"Failed to decode main payload body: {e}")
 
         return text_body, html_body
 
@@ -1610,8 +1758,10 @@ class GoogleDriveExporter:
         """
         attachments = []
 
-        def search_parts(part):
-            """Recursively search for attachments in message parts."""
+        # Depth-first walk with an explicit stack; sub-parts are pushed in reverse to keep document order
+        part_stack = [message.get("payload", {})]
+        while part_stack:
+            part = part_stack.pop()
             if part.get("filename") and part.get("body", {}).get("attachmentId"):
                 attachments.append(
                     {
@@ -1623,11 +1773,8 @@ class GoogleDriveExporter:
                 )
 
             if "parts" in part:
-                for subpart in part["parts"]:
-                    search_parts(subpart)
+                part_stack.extend(reversed(part["parts"]))
 
-        payload = message.get("payload", {})
-        search_parts(payload)
         return attachments
 
     def _fetch_message_content(self, message_id: str) -> dict[str, Any]:
@@ -1722,22 +1869,20 @@ class GoogleDriveExporter:
         Returns:
             Dictionary mapping thread_id to list of messages
         """
-        threads: dict[str, list[dict[str, Any]]] = {}
+        # (internal_date as int, message) pairs, so each date is converted once while grouping
+        threads: defaultdict[str, list[tuple[int, dict[str, Any]]]] = defaultdict(list)
 
         for message in messages:
-            thread_id_raw = message.get("thread_id", message.get("id"))
+            thread_id = message.get("thread_id", message.get("id"))
             # Ensure thread_id is a string before using as dict key
-            if isinstance(thread_id_raw, str):
-                thread_id: str = thread_id_raw
-                if thread_id not in threads:
-                    threads[thread_id] = []
-                threads[thread_id].append(message)
-
-        # Sort messages within each thread by internal_date
-        for thread_id in threads:
-            threads[thread_id].sort(key=lambda m: int(m.get("internal_date", 0)) if m.get("internal_date") else 0)
+            if isinstance(thread_id, str):
+                threads[thread_id].append((int(message.get("internal_date") or 0), message))
 
-        return threads
+        # Sort messages within each thread by internal_date (stable, so ties keep arrival order)
+        return {
+            thread_id: [message for _, message in sorted(entries, key=itemgetter(0))]
+            for thread_id, entries in threads.items()
+        }
 
     def _format_email_thread_as_json(self, thread_id: str, messages: list[dict[str, Any]]) -> str:
         """Format email thread as JSON string.
@@ -1768,7 +1913,7 @@ class GoogleDriveExporter:
             "exported_at": datetime.now(UTC).isoformat(),
         }
 
-        return json.dumps(thread_data, indent=2, ensure_ascii=False)
+        return _dump_json_text(thread_data)
 
     def _format_email_thread_as_markdown(self, thread_id: str, messages: list[dict[str, Any]]) -> str:
         """Format email thread as Markdown string with frontmatter.
@@ -1836,7 +1981,7 @@ class GoogleDriveExporter:
 
             if html_body:
                 try:
-                    body_md = convert_to_markdown(html_body)
+                    body_md = convert_with_handle(html_body, _HTML_TO_MARKDOWN)
                     md_content += body_md + "\n\n"
                 except Exception as e:
                     logger.warning(f"Failed to convert HTML to Markdown: {e}, using plain text")
@@ -1851,30 +1996,39 @@ class GoogleDriveExporter:
             if attachments:
                 md_content += "**Attachments:**\n\n"
                 for att in attachments:
-                    size_kb = att["size"] / 1024 if att.get("size") else 0
-                    md_content += f"- {att['filename']} ({size_kb:.1f} KB)\n"
+                    md_content += f"- {att['filename']} ({_format_size(att.get('size') or 0)})\n"
                 md_content += "\n"
 
             md_content += "---\n\n"
 
         return md_content
 
-    def _export_email_thread_as_json(self, thread_id: str, messages: list[dict[str, Any]], output_path: Path) -> bool:
+    @staticmethod
+    def _write_text_output(content: str, output: Path | TextIO) -> None:
+        """Write text to a file path (creating parent directories) or to an open text stream."""
+        if isinstance(output, Path):
+            output.parent.mkdir(parents=True, exist_ok=True)
+            with open(output, "w", encoding="utf-8") as f:
+                f.write(content)
+        else:
+            output.write(content)
+
+    def _export_email_thread_as_json(
+        self, thread_id: str, messages: list[dict[str, Any]], output_path: Path | TextIO
+    ) -> bool:
         """Export email thread as JSON file.
 
         Args:
             thread_id: Gmail thread ID
             messages: List of messages in thread
-            output_path: Path to save JSON file
+            output_path: Path to save JSON file, or an open text stream to write to
 
         Returns:
             True if successful, False otherwise
         """
         try:
             content = self._format_email_thread_as_json(thread_id, messages)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            self._write_text_output(content, output_path)
 
             logger.debug(f"Exported email thread to JSON: {output_path}")
             return True
@@ -1884,23 +2038,21 @@ class GoogleDriveExporter:
             return False
 
     def _export_email_thread_as_markdown(
-        self, thread_id: str, messages: list[dict[str, Any]], output_path: Path
+        self, thread_id: str, messages: list[dict[str, Any]], output_path: Path | TextIO
     ) -> bool:
         """Export email thread as Markdown file.
 
         Args:
             thread_id: Gmail thread ID
             messages: List of messages in thread
-            output_path: Path to save Markdown file
+            output_path: Path to save Markdown file, or an open text stream to write to
 
         Returns:
             True if successful, False otherwise
         """
         try:
             content = self._format_email_thread_as_markdown(thread_id, messages)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            self._write_text_output(content, output_path)
 
             logger.debug(f"Exported email thread to Markdown: {output_path}")
             return True
@@ -1971,7 +2123,7 @@ class GoogleDriveExporter:
                     if thread_messages
                     else "no-subject"
                 )
-                safe_subject = "".join(c if c.isalnum() or c in (" ", "-", "_") else "_" for c in subject)[:50]
+                safe_subject = _UNSAFE_SUBJECT_CHARS.sub("_", subject[:50])
 
                 # Organize by date
                 first_msg_date = thread_messages[0].get("internal_date", "0") if thread_messages else "0"
@@ -1999,7 +2151,7 @@ class GoogleDriveExporter:
             for message in messages:
                 message_id = message.get("id", "unknown")
                 subject = message.get("headers", {}).get("Subject", "no-subject")
-                safe_subject = "".join(c if c.isalnum() or c in (" ", "-", "_") else "_" for c in subject)[:50]
+                safe_subject = _UNSAFE_SUBJECT_CHARS.sub("_", subject[:50])
 
                 # Organize by date
                 msg_date = message.get("internal_date", "0")
@@ -2335,7 +2487,7 @@ class GoogleDriveExporter:
                 # Try to convert HTML to Markdown
                 if "<" in description and ">" in description:
                     try:
-                        desc_md = convert_to_markdown(description)
+                        desc_md = convert_with_handle(description, _HTML_TO_MARKDOWN)
                         md_content += desc_md + "\n\n"
                     except Exception as e:
                         logger.warning(f"Failed to convert description HTML to Markdown: {e}")
@@ -2465,7 +2617,7 @@ class GoogleDriveExporter:
             # Try to convert HTML to Markdown
             if "<" in description and ">" in description:
                 try:
-                    desc_md = convert_to_markdown(description)
+                    desc_md = convert_with_handle(description, _HTML_TO_MARKDOWN)
                     md_content += desc_md + "\n\n"
                 except Exception as e:
                     logger.warning(f"Failed to convert description HTML to Markdown: {e}")
@@ -2604,7 +2756,7 @@ class GoogleDriveExporter:
         for event in events:
             event_id = event.get("id", "unknown")
             summary = event.get("summary", "no-title")
-            safe_summary = "".join(c if c.isalnum() or c in (" ", "-", "_") else "_" for c in summary)[:50]
+            safe_summary = _UNSAFE_SUBJECT_CHARS.sub("_", summary[:50])
 
             # Get calendar ID and start date for organization
             calendar_id = event.get("_calendar_id", "primary")
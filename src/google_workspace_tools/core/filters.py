@@ -6,6 +6,11 @@ from typing import Literal
 from pydantic import BaseModel, Field
 
 
+def _gmail_date(value: datetime) -> str:
+    """Format a date as YYYY/MM/DD for Gmail's after:/before: operators, without strftime's locale machinery."""
+    return f"{value.year:04d}/{value.month:02d}/{value.day:02d}"
+
+
 class GmailSearchFilter(BaseModel):
     """Filter options for Gmail message search and export.
 
@@ -59,7 +64,7 @@ class GmailSearchFilter(BaseModel):
             >>> filter.build_query()
             'meeting label:INBOX'
         """
-        parts = []
+        parts: list[str] = []
 
         # Add user query first
         if self.query:
@@ -68,15 +73,14 @@ class GmailSearchFilter(BaseModel):
         # Add date filters
         if self.after_date:
             # Format: after:YYYY/MM/DD
-            parts.append(f"after:{self.after_date.strftime('%Y/%m/%d')}")
+            parts.append(f"after:{_gmail_date(self.after_date)}")
 
         if self.before_date:
             # Format: before:YYYY/MM/DD
-            parts.append(f"before:{self.before_date.strftime('%Y/%m/%d')}")
+            parts.append(f"before:{_gmail_date(self.before_date)}")
 
         # Add label filters
-        for label in self.labels:
-            parts.append(f"label:{label}")
+        parts.extend(f"label:{label}" for label in self.labels)
 
         # Add attachment filter
         if self.has_attachment is not None:
@@ -85,7 +89,7 @@ class GmailSearchFilter(BaseModel):
             else:
                 parts.append("-has:attachment")
 
-        return " ".join(parts) if parts else ""
+        return " ".join(parts)
 
 
 class CalendarEventFilter(BaseModel):
@@ -1,6 +1,7 @@
 """Pytest fixtures for Google Workspace Tools tests."""
 
 import base64
+from functools import partial
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock
@@ -189,6 +190,28 @@ def isolated_exporter(
     return exporter
 
 
+def _make_exporter(base_dir: Path, **config_overrides) -> GoogleDriveExporter:
+    """Build an exporter whose credential, token and export paths live under ``base_dir``."""
+    defaults = {
+        "credentials_path": base_dir / "creds.json",
+        "token_path": base_dir / "token.json",
+        "target_directory": base_dir / "exports",
+    }
+    defaults.update(config_overrides)
+    config = GoogleDriveExporterConfig(**defaults)
+    (base_dir / "exports").mkdir(exist_ok=True)
+
+    exporter = GoogleDriveExporter(config)
+
+    # Initialize services to None to prevent accidental auth
+    # Tests that need services should use isolated_exporter instead
+    exporter._service = None
+    exporter._gmail_service = None
+    exporter._calendar_service = None
+
+    return exporter
+
+
 @pytest.fixture
 def exporter_factory(tmp_path: Path):
     """Factory to create isolated exporters with custom config.
@@ -204,28 +227,59 @@ def exporter_factory(tmp_path: Path):
         def test_spreadsheet_mode(exporter_factory):
             exporter = exporter_factory(spreadsheet_export_mode="separate")
     """
+    return partial(_make_exporter, tmp_path)
+
+
+@pytest.fixture(scope="class")
+def class_tmp_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Temporary directory shared by all tests in a class.
+
+    Tests writing into it must use file names unique within the class.
+    """
+    return tmp_path_factory.mktemp("class")
 
-    def _create(**config_overrides) -> GoogleDriveExporter:
-        defaults = {
-            "credentials_path": tmp_path / "creds.json",
-            "token_path": tmp_path / "token.json",
-            "target_directory": tmp_path / "exports",
-        }
-        defaults.update(config_overrides)
-        config = GoogleDriveExporterConfig(**defaults)
-        (tmp_path / "exports").mkdir(exist_ok=True)
 
-        exporter = GoogleDriveExporter(config)
+@pytest.fixture(scope="class")
+def class_exporter_factory(class_tmp_path: Path):
+    """Class-scoped variant of ``exporter_factory``.
 
-        # Initialize services to None to prevent accidental auth
-        # Tests that need services should use isolated_exporter instead
-        exporter._service = None
-        exporter._gmail_service = None
-        exporter._calendar_service = None
+    For test classes that only call stateless export methods, so one
+    exporter can be built per class and shared by its tests.
+
+    Example:
+        @pytest.fixture(scope="class")
+        @classmethod
+        def exporter(cls, class_exporter_factory):
+            return class_exporter_factory(enable_frontmatter=True)
+    """
+    return partial(_make_exporter, class_tmp_path)
+
+
+@pytest.fixture(scope="session")
+def session_exporter(tmp_path_factory: pytest.TempPathFactory) -> GoogleDriveExporter:
+    """Default-config exporter shared by the whole session (one per xdist worker).
+
+    Only for tests that call pure helpers and never mutate exporter state;
+    use ``exporter_factory`` when a test needs custom config or its own files.
+    """
+    return _make_exporter(tmp_path_factory.mktemp("session"))
+
+
+@pytest.fixture
+def captured_writes(monkeypatch: pytest.MonkeyPatch) -> dict[Path, str]:
+    """Record every ``Path.write_text`` call by path, still writing through to disk.
+
+    Lets tests assert on written content without reading the file back.
+    """
+    writes: dict[Path, str] = {}
+    original_write_text = Path.write_text
 
-        return exporter
+    def write_text(self: Path, data: str, *args: Any, **kwargs: Any) -> int:
+        writes[self] = data
+        return original_write_text(self, data, *args, **kwargs)
 
-    return _create
+    monkeypatch.setattr(Path, "write_text", write_text)
+    return writes
 
 
 # =============================================================================
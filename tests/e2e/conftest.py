@@ -0,0 +1,101 @@
+"""Pytest fixtures for CLI end-to-end tests."""
+
+import importlib
+from collections.abc import Iterator
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from click.testing import Result
+from typer.testing import CliRunner
+
+# Loaded by name: the commands package re-exports a ``mail`` function that shadows this submodule,
+# so ``from ... import mail`` and monkeypatch's dotted-string lookup both resolve to the function
+_MAIL_MODULE = importlib.import_module("google_workspace_tools.cli.commands.mail")
+
+# Empty results for the exporter calls the CLI commands make; tests override as needed
+_EXPORTER_DEFAULTS = {
+    "export_calendar_events.return_value": {},
+    "export_emails.return_value": {},
+    "format_calendar_events_as_string.return_value": "",
+    "format_emails_as_string.return_value": "",
+    "list_calendars.return_value": [],
+}
+
+
+@pytest.fixture(scope="session")
+def help_outputs() -> dict[str, Result]:
+    """``--help`` results for the root app and the calendar/mail commands.
+
+    Help text is deterministic, so each one is rendered once per session
+    and shared by every test that only inspects it.
+    """
+    from google_workspace_tools.cli.app import app
+
+    runner = CliRunner(env={"NO_COLOR": "1", "TERM": "dumb", "COLUMNS": "200"})
+    return {
+        "root": runner.invoke(app, ["--help"]),
+        "calendar": runner.invoke(app, ["calendar", "--help"]),
+        "mail": runner.invoke(app, ["mail", "--help"]),
+    }
+
+
+@pytest.fixture(scope="session")
+def creds(tmp_path_factory: pytest.TempPathFactory) -> SimpleNamespace:
+    """Dummy OAuth client credentials file shared by the whole session.
+
+    The exporter is always mocked in these tests, so the file is never
+    read back; it only has to exist for the ``-c`` option. Exposes the
+    file as ``path`` and, for CLI argv, as the string ``s``.
+    """
+    path = tmp_path_factory.mktemp("creds") / "creds.json"
+    path.write_text('{"web":{"client_id":"test"}}')
+    return SimpleNamespace(path=path, s=str(path))
+
+
+@pytest.fixture(scope="module")
+def shared_tmp(tmp_path_factory: pytest.TempPathFactory) -> SimpleNamespace:
+    """Output directory shared by all tests in a module.
+
+    For tests that only need a path to pass to ``-o``; the exporter is
+    mocked, so nothing is written there. Exposed like ``creds``, as
+    ``path`` and as the argv string ``s``.
+    """
+    path = tmp_path_factory.mktemp("shared")
+    return SimpleNamespace(path=path, s=str(path))
+
+
+@pytest.fixture(scope="module")
+def mock_create_exporter() -> Iterator[MagicMock]:
+    """Patch the calendar command's exporter factory once per test module."""
+    with patch("google_workspace_tools.cli.commands.calendar._create_exporter") as factory:
+        yield factory
+
+
+@pytest.fixture
+def mock_exporter(mock_create_exporter: MagicMock) -> MagicMock:
+    """Fresh exporter mock handed out by the patched calendar factory.
+
+    A new ``MagicMock`` configured from ``_EXPORTER_DEFAULTS`` is used for
+    every test rather than a copy of a shared template: ``copy.copy`` on a
+    mock shares its child mocks, so configured return values and call
+    records would leak between tests.
+    """
+    mock_create_exporter.reset_mock()
+    exporter = MagicMock()
+    exporter.configure_mock(**_EXPORTER_DEFAULTS)
+    mock_create_exporter.return_value = exporter
+    return exporter
+
+
+@pytest.fixture
+def mail_exporter(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Exporter mock returned by the mail command's ``GoogleDriveExporter``.
+
+    The class is swapped with ``monkeypatch.setattr``; the instance is
+    configured from ``_EXPORTER_DEFAULTS`` like ``mock_exporter``.
+    """
+    exporter = MagicMock()
+    exporter.configure_mock(**_EXPORTER_DEFAULTS)
+    monkeypatch.setattr(_MAIL_MODULE, "GoogleDriveExporter", MagicMock(return_value=exporter))
+    return exporter
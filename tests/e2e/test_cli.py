@@ -1,6 +1,7 @@
 """End-to-end tests for CLI commands."""
 
-from unittest.mock import MagicMock, patch
+import importlib
+from unittest.mock import MagicMock
 
 import pytest
 from typer.testing import CliRunner
@@ -9,6 +10,9 @@ from google_workspace_tools.cli.app import app
 
 runner = CliRunner()
 
+# Loaded by name: the commands package re-exports a ``download`` function that shadows this submodule
+_DOWNLOAD_MODULE = importlib.import_module("google_workspace_tools.cli.commands.download")
+
 
 @pytest.mark.e2e
 class TestCLIHelp:
@@ -144,8 +148,7 @@ class TestExtractIdCommand:
 class TestDownloadCommand:
     """Tests for download command (without actual API calls)."""
 
-    @patch("google_workspace_tools.cli.commands.download.GoogleDriveExporter")
-    def test_download_reports_errors(self, mock_exporter_class, tmp_path):
+    def test_download_reports_errors(self, monkeypatch, shared_tmp, creds):
         """Test that download reports errors gracefully when export fails."""
         # Setup mock exporter to return empty results (simulating export failure)
         mock_exporter = MagicMock()
@@ -157,7 +160,7 @@ class TestDownloadCommand:
             "name": "Test Doc",
             "mimeType": "application/vnd.google-apps.document",
         }
-        mock_exporter_class.return_value = mock_exporter
+        monkeypatch.setattr(_DOWNLOAD_MODULE, "GoogleDriveExporter", MagicMock(return_value=mock_exporter))
 
         result = runner.invoke(
             app,
@@ -165,9 +168,9 @@ class TestDownloadCommand:
                 "download",
                 "abc123",
                 "-c",
-                str(tmp_path / "creds.json"),
+                creds.s,
                 "-o",
-                str(tmp_path / "output"),
+                shared_tmp.s,
             ],
         )
         # The command exits with error code when no documents are exported
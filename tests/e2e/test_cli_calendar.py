@@ -1,52 +1,86 @@
 """End-to-end tests for Calendar CLI commands."""
 
-from unittest.mock import MagicMock, patch
+import re
+from datetime import datetime
 
 import pytest
 from typer.testing import CliRunner
 
 from google_workspace_tools.cli.app import app
-
-runner = CliRunner()
+from google_workspace_tools.cli.commands.calendar import calendar_export
+
+# Plain, wide terminal so Rich skips colour/markup rendering and help text does not wrap
+runner = CliRunner(env={"NO_COLOR": "1", "TERM": "dumb", "COLUMNS": "200"})
+
+# Static argv fragments, built once at import
+_CALENDAR_LIST = ("calendar", "list")
+_CALENDAR_GET = ("calendar", "get")
+_CALENDAR_EXPORT = ("calendar", "export")
+
+_CALENDAR_LIST_HELP = (*_CALENDAR_LIST, "--help")
+_CALENDAR_GET_HELP = (*_CALENDAR_GET, "--help")
+_CALENDAR_EXPORT_HELP = (*_CALENDAR_EXPORT, "--help")
+
+# Subcommand argv ending in `-c`; tests append the credentials path and options
+_LIST_ARGV = (*_CALENDAR_LIST, "-c")
+_GET_ARGV = (*_CALENDAR_GET, "-c")
+_EXPORT_ARGV = (*_CALENDAR_EXPORT, "-c")
+
+# Each named group must match somewhere in `calendar export --help`
+_EXPORT_HELP_PATTERN = re.compile(
+    r"(?P<summary>Export Google Calendar events)"
+    r"|(?P<calendar>--calendar)"
+    r"|(?P<format>--format|-f\b)"
+    r"|(?P<after>--after|-a\b)"
+    r"|(?P<before>--before|-b\b)"
+)
+
+# Failure messages, matched case-insensitively without lowercasing the whole output
+_ERR_RE = re.compile(r"error", re.IGNORECASE)
+_NOT_FOUND_RE = re.compile(r"not found", re.IGNORECASE)
+
+# Option sets for `calendar export` that only need to parse and run cleanly
+_EXPORT_ARGV_CASES = [
+    pytest.param(("-a", "2024-01-01", "-b", "2024-12-31"), id="time_range"),
+    pytest.param(("-q", "meeting", "-f", "json"), id="json_format"),
+    pytest.param(("-q", "meeting", "-d", "2"), id="link_following"),
+    pytest.param(("-q", "meeting", "-n", "100"), id="max_results"),
+]
 
 
 @pytest.mark.e2e
 class TestCalendarHelp:
     """Tests for calendar help output."""
 
-    def test_calendar_help(self):
+    def test_calendar_help(self, help_outputs):
         """Test calendar command help shows subcommands."""
-        result = runner.invoke(app, ["calendar", "--help"])
+        result = help_outputs["calendar"]
         assert result.exit_code == 0
-        assert "list" in result.stdout
-        assert "get" in result.stdout
-        assert "export" in result.stdout
+        assert {"list", "get", "export"} <= set(result.stdout.split())
 
     def test_calendar_list_help(self):
         """Test calendar list subcommand help."""
-        result = runner.invoke(app, ["calendar", "list", "--help"])
+        result = runner.invoke(app, list(_CALENDAR_LIST_HELP), catch_exceptions=False)
         assert result.exit_code == 0
         assert "--credentials" in result.stdout or "-c" in result.stdout
 
     def test_calendar_get_help(self):
         """Test calendar get subcommand help."""
-        result = runner.invoke(app, ["calendar", "get", "--help"])
+        result = runner.invoke(app, list(_CALENDAR_GET_HELP), catch_exceptions=False)
         assert result.exit_code == 0
         assert "--event-id" in result.stdout or "-e" in result.stdout
         assert "--calendar" in result.stdout
 
     def test_calendar_export_help(self):
         """Test calendar export subcommand help."""
-        result = runner.invoke(app, ["calendar", "export", "--help"])
+        result = runner.invoke(app, list(_CALENDAR_EXPORT_HELP), catch_exceptions=False)
         assert result.exit_code == 0
-        assert "--calendar" in result.stdout
-        assert "-f" in result.stdout or "--format" in result.stdout
-        assert "-a" in result.stdout or "--after" in result.stdout
-        assert "-b" in result.stdout or "--before" in result.stdout
+        found = {match.lastgroup for match in _EXPORT_HELP_PATTERN.finditer(result.stdout)}
+        assert found == {"summary", "calendar", "format", "after", "before"}
 
-    def test_calendar_in_main_help(self):
+    def test_calendar_in_main_help(self, help_outputs):
         """Test that calendar appears in main help."""
-        result = runner.invoke(app, ["--help"])
+        result = help_outputs["root"]
         assert result.exit_code == 0
         assert "calendar" in result.stdout
 
@@ -55,309 +89,144 @@ class TestCalendarHelp:
 class TestCalendarList:
     """Tests for calendar list subcommand."""
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_list(self, mock_create_exporter, tmp_path):
+    def test_calendar_list(self, mock_exporter, creds):
         """Test calendar list subcommand."""
-        mock_exporter = MagicMock()
         mock_exporter.list_calendars.return_value = [
             {"id": "primary", "summary": "My Calendar", "primary": True},
             {"id": "work@example.com", "summary": "Work Calendar", "primary": False},
         ]
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
 
         result = runner.invoke(
             app,
-            ["calendar", "list", "-c", str(creds_file)],
+            [*_LIST_ARGV, creds.s],
+            catch_exceptions=False,
         )
 
         # Should display calendar information
-        if result.exit_code == 0:
-            assert "Calendar" in result.stdout or "calendar" in result.stdout.lower()
+        assert result.exit_code == 0
+        assert "Calendar" in result.stdout or "calendar" in result.stdout.lower()
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_list_empty(self, mock_create_exporter, tmp_path):
+    def test_calendar_list_empty(self, mock_exporter, creds):
         """Test calendar list with no calendars."""
-        mock_exporter = MagicMock()
-        mock_exporter.list_calendars.return_value = []
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
         result = runner.invoke(
             app,
-            ["calendar", "list", "-c", str(creds_file)],
+            [*_LIST_ARGV, creds.s],
+            catch_exceptions=False,
         )
 
         # Should handle empty list gracefully
-        assert result.exit_code in [0, 1]
-        if result.exit_code == 0:
-            assert "0" in result.stdout or "No calendars" in result.stdout
+        assert result.exit_code == 0
+        assert "0" in result.stdout or "No calendars" in result.stdout
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_list_error_handling(self, mock_create_exporter):
+    def test_calendar_list_error_handling(self, mock_exporter):
         """Test calendar list error handling with authentication failure."""
-        mock_exporter = MagicMock()
         mock_exporter.list_calendars.side_effect = Exception("Authentication failed")
-        mock_create_exporter.return_value = mock_exporter
 
         result = runner.invoke(
             app,
-            ["calendar", "list", "-c", "/nonexistent/creds.json"],
+            [*_LIST_ARGV, "/nonexistent/creds.json"],
         )
 
         # Should fail gracefully
         assert result.exit_code == 1
-        assert "Error" in result.stdout or "error" in result.stdout.lower()
+        assert _ERR_RE.search(result.stdout)
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_list_table_formatting(self, mock_create_exporter, tmp_path):
+    def test_calendar_list_table_formatting(self, mock_exporter, creds):
         """Test calendar list table formatting."""
-        mock_exporter = MagicMock()
         mock_exporter.list_calendars.return_value = [
             {"id": "primary", "summary": "Personal Calendar", "primary": True},
             {"id": "work@company.com", "summary": "Work Calendar", "primary": False},
             {"id": "team@company.com", "summary": "Team Events", "primary": False},
         ]
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
 
         result = runner.invoke(
             app,
-            ["calendar", "list", "-c", str(creds_file)],
+            [*_LIST_ARGV, creds.s],
+            catch_exceptions=False,
         )
 
         # Check for table formatting
-        if result.exit_code == 0:
-            # Should show total count
-            assert "3" in result.stdout
+        assert result.exit_code == 0
+        # Should show total count
+        assert "3" in result.stdout
 
 
 @pytest.mark.e2e
 class TestCalendarExportCommand:
     """Tests for calendar export subcommand."""
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_export_with_time_range(self, mock_create_exporter, tmp_path):
-        """Test calendar export with time range filters."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_calendar_events.return_value = {}
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        result = runner.invoke(
-            app,
-            [
-                "calendar",
-                "export",
-                "-a",
-                "2024-01-01",
-                "-b",
-                "2024-12-31",
-                "-c",
-                str(creds_file),
-            ],
-        )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_export_specific_calendar(self, mock_create_exporter, tmp_path):
-        """Test calendar export with specific calendar ID."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_calendar_events.return_value = {}
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        result = runner.invoke(
-            app,
-            [
-                "calendar",
-                "export",
-                "--calendar",
-                "work@example.com",
-                "-a",
-                "2024-01-01",
-                "-c",
-                str(creds_file),
-            ],
-        )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_export_with_query(self, mock_create_exporter, tmp_path):
-        """Test calendar export with search query."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_calendar_events.return_value = {}
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        result = runner.invoke(
-            app,
-            [
-                "calendar",
-                "export",
-                "-q",
-                "sprint planning",
-                "-c",
-                str(creds_file),
-            ],
-        )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_export_json_format(self, mock_create_exporter, tmp_path):
-        """Test calendar export with JSON format."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_calendar_events.return_value = {}
-        mock_create_exporter.return_value = mock_exporter
+    @pytest.mark.parametrize("extra_args", _EXPORT_ARGV_CASES)
+    def test_calendar_export_options(self, mock_exporter, creds, extra_args):
+        """Test calendar export with each filter and format option."""
+        result = runner.invoke(app, [*_EXPORT_ARGV, creds.s, *extra_args], catch_exceptions=False)
 
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        result = runner.invoke(
-            app,
-            [
-                "calendar",
-                "export",
-                "-q",
-                "meeting",
-                "-f",
-                "json",
-                "-c",
-                str(creds_file),
-            ],
-        )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_export_with_link_following(self, mock_create_exporter, tmp_path):
-        """Test calendar export with link following enabled."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_calendar_events.return_value = {}
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        result = runner.invoke(
-            app,
-            [
-                "calendar",
-                "export",
-                "-q",
-                "meeting",
-                "-d",
-                "2",
-                "-c",
-                str(creds_file),
-            ],
-        )
-
-        assert result.exit_code in [0, 1]
+        assert result.exit_code == 0
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_export_max_results(self, mock_create_exporter, tmp_path):
-        """Test calendar export with max results limit."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_calendar_events.return_value = {}
-        mock_create_exporter.return_value = mock_exporter
+    def test_calendar_export_specific_calendar(self, mock_exporter, creds):
+        """Test calendar export with specific calendar ID (callback called directly)."""
+        calendar_export(calendar_id="work@example.com", after="2024-01-01", credentials=creds.path)
 
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
+        filters = mock_exporter.format_calendar_events_as_string.call_args.kwargs["filters"]
+        assert filters.get_calendar_ids() == ["work@example.com"]
+        assert filters.time_min == datetime(2024, 1, 1)
 
-        result = runner.invoke(
-            app,
-            [
-                "calendar",
-                "export",
-                "-q",
-                "meeting",
-                "-n",
-                "100",
-                "-c",
-                str(creds_file),
-            ],
-        )
+    def test_calendar_export_with_query(self, mock_exporter, creds):
+        """Test calendar export with search query (callback called directly)."""
+        calendar_export(query="sprint planning", credentials=creds.path)
 
-        assert result.exit_code in [0, 1]
+        filters = mock_exporter.format_calendar_events_as_string.call_args.kwargs["filters"]
+        assert filters.query == "sprint planning"
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_export_error_handling(self, mock_create_exporter):
+    def test_calendar_export_error_handling(self, mock_exporter):
         """Test calendar export error handling with authentication failure."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_calendar_events.side_effect = Exception("Authentication failed")
-        mock_create_exporter.return_value = mock_exporter
+        mock_exporter.format_calendar_events_as_string.side_effect = Exception("Authentication failed")
 
         result = runner.invoke(
             app,
             [
-                "calendar",
-                "export",
+                *_EXPORT_ARGV,
+                "/nonexistent/creds.json",
                 "-q",
                 "meeting",
-                "-c",
-                "/nonexistent/creds.json",
             ],
         )
 
         # Should fail gracefully
         assert result.exit_code == 1
-        assert "Error" in result.stdout or "error" in result.stdout.lower()
+        assert _ERR_RE.search(result.stdout)
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_export_output_formatting(self, mock_create_exporter, tmp_path):
+    def test_calendar_export_output_formatting(self, mock_exporter, shared_tmp, creds):
         """Test calendar export output formatting."""
-        mock_exporter = MagicMock()
         mock_exporter.export_calendar_events.return_value = {
-            "event1": tmp_path / "event1.md",
-            "event2": tmp_path / "event2.md",
-            "event3": tmp_path / "event3.md",
+            "event1": shared_tmp.path / "event1.md",
+            "event2": shared_tmp.path / "event2.md",
+            "event3": shared_tmp.path / "event3.md",
         }
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
 
         result = runner.invoke(
             app,
             [
-                "calendar",
-                "export",
+                *_EXPORT_ARGV,
+                creds.s,
                 "-q",
                 "meeting",
-                "-c",
-                str(creds_file),
+                "-o",
+                shared_tmp.s,
             ],
+            catch_exceptions=False,
         )
 
         # Check for success message formatting
-        if result.exit_code == 0:
-            assert "exported" in result.stdout.lower() or "3" in result.stdout
+        assert result.exit_code == 0
+        assert "exported" in result.stdout.lower() or "3" in result.stdout
 
 
 @pytest.mark.e2e
 class TestCalendarGetCommand:
     """Tests for calendar get subcommand."""
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_get_event(self, mock_create_exporter, tmp_path):
+    def test_calendar_get_event(self, mock_exporter, shared_tmp, creds):
         """Test calendar get with event ID."""
-        mock_exporter = MagicMock()
         mock_exporter.get_calendar_event.return_value = {
             "id": "event123",
             "summary": "Test Event",
@@ -365,72 +234,51 @@ class TestCalendarGetCommand:
             "end": {"dateTime": "2024-01-15T11:00:00Z"},
         }
         mock_exporter._export_calendar_event_as_markdown.return_value = True
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
 
         result = runner.invoke(
             app,
             [
-                "calendar",
-                "get",
+                *_GET_ARGV,
+                creds.s,
                 "-e",
                 "event123",
-                "-c",
-                str(creds_file),
                 "-o",
-                str(tmp_path),
+                shared_tmp.s,
             ],
+            catch_exceptions=False,
         )
 
-        assert result.exit_code in [0, 1]
+        assert result.exit_code == 0
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_get_event_not_found(self, mock_create_exporter, tmp_path):
+    def test_calendar_get_event_not_found(self, mock_exporter, creds):
         """Test calendar get when event is not found."""
-        mock_exporter = MagicMock()
         mock_exporter.get_calendar_event.return_value = None
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
 
         result = runner.invoke(
             app,
             [
-                "calendar",
-                "get",
+                *_GET_ARGV,
+                creds.s,
                 "-e",
                 "nonexistent",
-                "-c",
-                str(creds_file),
             ],
         )
 
         assert result.exit_code == 1
-        assert "not found" in result.stdout.lower() or "error" in result.stdout.lower()
+        assert _NOT_FOUND_RE.search(result.stdout) or _ERR_RE.search(result.stdout)
 
 
 @pytest.mark.e2e
 class TestCalendarIntegration:
     """Integration tests for calendar commands with realistic scenarios."""
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_calendar_export_combined_filters(self, mock_create_exporter, tmp_path):
+    def test_calendar_export_combined_filters(self, mock_exporter, shared_tmp, creds):
         """Test calendar export with multiple combined filters."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_calendar_events.return_value = {}
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
         result = runner.invoke(
             app,
             [
-                "calendar",
-                "export",
+                *_EXPORT_ARGV,
+                creds.s,
                 "--calendar",
                 "work@example.com",
                 "-a",
@@ -445,47 +293,39 @@ class TestCalendarIntegration:
                 "100",
                 "-d",
                 "1",
-                "-c",
-                str(creds_file),
                 "-o",
-                str(tmp_path / "calendar"),
+                shared_tmp.s,
             ],
+            catch_exceptions=False,
         )
 
-        assert result.exit_code in [0, 1]
+        assert result.exit_code == 0
 
-    @patch("google_workspace_tools.cli.commands.calendar._create_exporter")
-    def test_workflow_list_then_export(self, mock_create_exporter, tmp_path):
+    def test_workflow_list_then_export(self, mock_exporter, creds):
         """Test realistic workflow: list calendars, then export with filters."""
-        mock_exporter = MagicMock()
         mock_exporter.list_calendars.return_value = [{"id": "work@company.com", "summary": "Work", "primary": False}]
-        mock_exporter.export_calendar_events.return_value = {}
-        mock_create_exporter.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
 
         # Step 1: List calendars
         result1 = runner.invoke(
             app,
-            ["calendar", "list", "-c", str(creds_file)],
+            [*_LIST_ARGV, creds.s],
+            catch_exceptions=False,
         )
 
         # Step 2: Export from specific calendar
         result2 = runner.invoke(
             app,
             [
-                "calendar",
-                "export",
+                *_EXPORT_ARGV,
+                creds.s,
                 "--calendar",
                 "work@company.com",
                 "-q",
                 "standup",
-                "-c",
-                str(creds_file),
             ],
+            catch_exceptions=False,
         )
 
-        # Both commands should complete
-        assert result1.exit_code in [0, 1]
-        assert result2.exit_code in [0, 1]
+        # Both commands should succeed
+        assert result1.exit_code == 0
+        assert result2.exit_code == 0
@@ -1,31 +1,52 @@
 """End-to-end tests for Gmail CLI commands."""
 
-from unittest.mock import MagicMock, patch
+import re
 
 import pytest
 from typer.testing import CliRunner
 
 from google_workspace_tools.cli.app import app
+from google_workspace_tools.cli.commands.mail import mail
 
-runner = CliRunner()
+# Plain, wide terminal so Rich skips colour/markup rendering and help text does not wrap
+runner = CliRunner(env={"NO_COLOR": "1", "TERM": "dumb", "COLUMNS": "200"})
+
+# Failure message, matched case-insensitively without lowercasing the whole output
+_ERR_RE = re.compile(r"error", re.IGNORECASE)
+
+# `mail` argv ending in `-c`; tests append the credentials path and options
+_MAIL_ARGV = ("mail", "-c")
+
+# Option sets for `mail` that only need to parse and run cleanly
+_MAIL_ARGV_CASES = [
+    pytest.param(("-q", "from:boss@example.com", "-f", "md"), id="query"),
+    pytest.param(("-a", "2024-01-01", "-b", "2024-12-31"), id="date_range"),
+    pytest.param(("-l", "work,important"), id="labels"),
+    pytest.param(("-f", "json"), id="json_format"),
+    pytest.param(("-m", "individual"), id="individual_mode"),
+    pytest.param(("-d", "2"), id="link_following"),
+    pytest.param(("-n", "50"), id="max_results"),
+]
 
 
 @pytest.mark.e2e
 class TestMailHelp:
     """Tests for mail help output."""
 
-    def test_mail_help(self):
+    def test_mail_help(self, help_outputs):
         """Test mail command help."""
-        result = runner.invoke(app, ["mail", "--help"])
+        result = help_outputs["mail"]
         assert result.exit_code == 0
-        assert "Export Gmail messages" in result.stdout
-        assert "-q" in result.stdout or "--query" in result.stdout
-        assert "-f" in result.stdout or "--format" in result.stdout
-        assert "-m" in result.stdout or "--mode" in result.stdout
-
-    def test_mail_in_main_help(self):
+        out = result.stdout
+        lowered = out.lower()
+        assert "export gmail messages" in lowered
+        # Output defaults to stdout; --output switches to files
+        assert "stdout" in lowered
+        assert {"--query", "-q", "--format", "-f", "--mode", "-m", "--output"} <= set(out.split())
+
+    def test_mail_in_main_help(self, help_outputs):
         """Test that mail appears in main help."""
-        result = runner.invoke(app, ["--help"])
+        result = help_outputs["root"]
         assert result.exit_code == 0
         assert "mail" in result.stdout
 
@@ -34,355 +55,129 @@ class TestMailHelp:
 class TestMailCommand:
     """Tests for mail command execution."""
 
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_with_defaults(self, mock_exporter_class, tmp_path):
+    def test_mail_with_defaults(self, mail_exporter, shared_tmp, creds):
         """Test mail with default parameters."""
-        # Mock the exporter instance
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {}
-        mock_exporter_class.return_value = mock_exporter
-
-        # Mock _authenticate to avoid actual OAuth
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-c",
-                    str(tmp_path / "creds.json"),
-                    "-o",
-                    str(tmp_path / "emails"),
-                ],
-            )
-
-        # Should complete (may not export anything without valid auth, but shouldn't crash)
-        assert result.exit_code in [0, 1]  # May exit with error if auth fails
-
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_with_query(self, mock_exporter_class, tmp_path):
-        """Test mail with search query."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {"msg1": tmp_path / "msg1.md"}
-        mock_exporter_class.return_value = mock_exporter
-
-        # Create dummy credentials file
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-q",
-                    "from:boss@example.com",
-                    "-f",
-                    "md",
-                    "-c",
-                    str(creds_file),
-                    "-o",
-                    str(tmp_path / "emails"),
-                ],
-            )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_with_date_range(self, mock_exporter_class, tmp_path):
-        """Test mail with date range filters."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {}
-        mock_exporter_class.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-a",
-                    "2024-01-01",
-                    "-b",
-                    "2024-12-31",
-                    "-c",
-                    str(creds_file),
-                ],
-            )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_with_labels(self, mock_exporter_class, tmp_path):
-        """Test mail with label filters."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {}
-        mock_exporter_class.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-l",
-                    "work,important",
-                    "-c",
-                    str(creds_file),
-                ],
-            )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_json_format(self, mock_exporter_class, tmp_path):
-        """Test mail with JSON format."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {}
-        mock_exporter_class.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-f",
-                    "json",
-                    "-c",
-                    str(creds_file),
-                ],
-            )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_individual_mode(self, mock_exporter_class, tmp_path):
-        """Test mail with individual message mode."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {}
-        mock_exporter_class.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-m",
-                    "individual",
-                    "-c",
-                    str(creds_file),
-                ],
-            )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_with_link_following(self, mock_exporter_class, tmp_path):
-        """Test mail with link following enabled."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {}
-        mock_exporter_class.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-d",
-                    "2",
-                    "-c",
-                    str(creds_file),
-                ],
-            )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_max_results(self, mock_exporter_class, tmp_path):
-        """Test mail with max results limit."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {}
-        mock_exporter_class.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-n",
-                    "50",
-                    "-c",
-                    str(creds_file),
-                ],
-            )
-
-        assert result.exit_code in [0, 1]
-
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_error_handling(self, mock_exporter_class):
+        result = runner.invoke(
+            app,
+            [
+                *_MAIL_ARGV,
+                creds.s,
+                "-o",
+                shared_tmp.s,
+            ],
+            catch_exceptions=False,
+        )
+
+        # Nothing matched, but the export itself should succeed
+        assert result.exit_code == 0
+
+    @pytest.mark.parametrize("extra_args", _MAIL_ARGV_CASES)
+    def test_mail_options(self, mail_exporter, creds, extra_args):
+        """Test mail with each filter, format and mode option."""
+        result = runner.invoke(app, [*_MAIL_ARGV, creds.s, *extra_args], catch_exceptions=False)
+
+        assert result.exit_code == 0
+
+    def test_mail_error_handling(self, mail_exporter):
         """Test mail error handling with authentication failure."""
-        # Mock exporter to raise an error during initialization or export
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.side_effect = Exception("Authentication failed")
-        mock_exporter_class.return_value = mock_exporter
+        # Exporter fails while fetching messages
+        mail_exporter.format_emails_as_string.side_effect = Exception("Authentication failed")
 
         result = runner.invoke(
             app,
             [
-                "mail",
-                "-c",
+                *_MAIL_ARGV,
                 "/nonexistent/creds.json",
             ],
         )
 
         # Should fail gracefully
         assert result.exit_code == 1
-        assert "Error" in result.stdout or "error" in result.stdout.lower()
+        assert _ERR_RE.search(result.stdout)
 
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_output_formatting(self, mock_exporter_class, tmp_path):
+    def test_mail_output_formatting(self, mail_exporter, shared_tmp, creds):
         """Test mail output formatting."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {
-            "thread1": tmp_path / "thread1.md",
-            "thread2": tmp_path / "thread2.md",
+        mail_exporter.export_emails.return_value = {
+            "thread1": shared_tmp.path / "thread1.md",
+            "thread2": shared_tmp.path / "thread2.md",
         }
-        mock_exporter_class.return_value = mock_exporter
 
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-c",
-                    str(creds_file),
-                ],
-            )
+        result = runner.invoke(
+            app,
+            [
+                *_MAIL_ARGV,
+                creds.s,
+                "-o",
+                shared_tmp.s,
+            ],
+            catch_exceptions=False,
+        )
 
         # Check for success message formatting
-        if result.exit_code == 0:
-            assert "exported" in result.stdout.lower() or "2" in result.stdout
+        assert result.exit_code == 0
+        assert "exported" in result.stdout.lower() or "2" in result.stdout
 
 
 @pytest.mark.e2e
 class TestMailIntegration:
     """Integration tests for mail command with realistic scenarios."""
 
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_combined_filters(self, mock_exporter_class, tmp_path):
+    def test_mail_combined_filters(self, mail_exporter, shared_tmp, creds):
         """Test mail with multiple combined filters."""
-        mock_exporter = MagicMock()
-        mock_exporter.export_emails.return_value = {}
-        mock_exporter_class.return_value = mock_exporter
-
-        creds_file = tmp_path / "creds.json"
-        creds_file.write_text('{"web":{"client_id":"test"}}')
-
-        with patch.object(mock_exporter, "_authenticate", return_value=MagicMock()):
-            result = runner.invoke(
-                app,
-                [
-                    "mail",
-                    "-q",
-                    "has:attachment",
-                    "-a",
-                    "2024-01-01",
-                    "-l",
-                    "work,important",
-                    "-f",
-                    "md",
-                    "-m",
-                    "thread",
-                    "-n",
-                    "100",
-                    "-d",
-                    "1",
-                    "-c",
-                    str(creds_file),
-                    "-o",
-                    str(tmp_path / "emails"),
-                ],
-            )
-
-        assert result.exit_code in [0, 1]
+        result = runner.invoke(
+            app,
+            [
+                *_MAIL_ARGV,
+                creds.s,
+                "-q",
+                "has:attachment",
+                "-a",
+                "2024-01-01",
+                "-l",
+                "work,important",
+                "-f",
+                "md",
+                "-m",
+                "thread",
+                "-n",
+                "100",
+                "-d",
+                "1",
+                "-o",
+                shared_tmp.s,
+            ],
+            catch_exceptions=False,
+        )
+
+        assert result.exit_code == 0
 
 
 @pytest.mark.e2e
 class TestMailStdout:
     """Tests for mail command stdout output mode (default behavior)."""
 
-    def test_mail_help_shows_stdout_default(self):
-        """Test that help indicates stdout is default."""
-        result = runner.invoke(app, ["mail", "--help"])
-        assert result.exit_code == 0
-        assert "stdout" in result.stdout.lower()
-        assert "--output" in result.stdout
-
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_stdout_outputs_to_terminal(self, mock_exporter_class, tmp_path):
-        """Test that default mode outputs content to terminal instead of files."""
-        mock_exporter = MagicMock()
-        mock_exporter.format_emails_as_string.return_value = "# Email Thread: Test\n\nHello World"
-        mock_exporter_class.return_value = mock_exporter
+    def test_mail_stdout_outputs_to_terminal(self, mail_exporter, creds, capsys):
+        """Test that default mode outputs content to terminal instead of files (callback called directly)."""
+        mail_exporter.format_emails_as_string.return_value = "# Email Thread: Test\n\nHello World"
 
-        # No --output flag means stdout
-        result = runner.invoke(
-            app,
-            [
-                "mail",
-                "-c",
-                str(tmp_path / "creds.json"),
-            ],
-        )
+        # No output directory means stdout
+        mail(credentials=creds.path)
 
-        assert result.exit_code == 0
-        # Content should be in stdout
-        assert "# Email Thread: Test" in result.stdout
-        assert "Hello World" in result.stdout
+        out = capsys.readouterr().out
+        assert "# Email Thread: Test" in out
+        assert "Hello World" in out
         # format_emails_as_string should have been called
-        mock_exporter.format_emails_as_string.assert_called_once()
+        mail_exporter.format_emails_as_string.assert_called_once()
         # export_emails should NOT have been called (no file output)
-        mock_exporter.export_emails.assert_not_called()
+        mail_exporter.export_emails.assert_not_called()
 
-    @patch("google_workspace_tools.cli.commands.mail.GoogleDriveExporter")
-    def test_mail_stdout_with_json_format(self, mock_exporter_class, tmp_path):
-        """Test stdout mode with JSON format."""
-        mock_exporter = MagicMock()
-        mock_exporter.format_emails_as_string.return_value = '[{"thread_id": "123"}]'
-        mock_exporter_class.return_value = mock_exporter
+    def test_mail_stdout_with_json_format(self, mail_exporter, creds, capsys):
+        """Test stdout mode with JSON format (callback called directly)."""
+        mail_exporter.format_emails_as_string.return_value = '[{"thread_id": "123"}]'
 
-        # No --output flag means stdout
-        result = runner.invoke(
-            app,
-            [
-                "mail",
-                "-f",
-                "json",
-                "-c",
-                str(tmp_path / "creds.json"),
-            ],
-        )
+        mail(export_format="json", credentials=creds.path)
 
-        assert result.exit_code == 0
-        assert '"thread_id": "123"' in result.stdout
+        assert '"thread_id": "123"' in capsys.readouterr().out
         # Verify json format was passed
-        call_kwargs = mock_exporter.format_emails_as_string.call_args[1]
+        call_kwargs = mail_exporter.format_emails_as_string.call_args[1]
         assert call_kwargs["export_format"] == "json"
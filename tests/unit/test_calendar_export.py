@@ -2,6 +2,8 @@
 
 import json
 from datetime import datetime
+from pathlib import Path
+from typing import Any
 
 import pytest
 from pydantic import ValidationError
@@ -10,13 +12,18 @@ from google_workspace_tools.core.exporter import GoogleDriveExporter
 from google_workspace_tools.core.filters import CalendarEventFilter
 
 
+def _load_json(path: Path) -> Any:
+    """Parse an exported JSON file in one read."""
+    return json.loads(path.read_bytes())
+
+
 @pytest.mark.unit
 class TestCalendarEventFilter:
     """Tests for Calendar event filter configuration."""
 
     def test_default_values(self):
         """Test filter default values."""
-        filter_obj = CalendarEventFilter()
+        filter_obj = CalendarEventFilter.model_construct()
         assert filter_obj.time_min is None
         assert filter_obj.time_max is None
         assert filter_obj.calendar_ids == ["primary"]
@@ -27,17 +34,17 @@ class TestCalendarEventFilter:
 
     def test_get_calendar_ids_default(self):
         """Test getting calendar IDs with default."""
-        filter_obj = CalendarEventFilter()
+        filter_obj = CalendarEventFilter.model_construct()
         assert filter_obj.get_calendar_ids() == ["primary"]
 
     def test_get_calendar_ids_custom(self):
         """Test getting custom calendar IDs."""
-        filter_obj = CalendarEventFilter(calendar_ids=["work@example.com", "personal@example.com"])
+        filter_obj = CalendarEventFilter.model_construct(calendar_ids=["work@example.com", "personal@example.com"])
         assert filter_obj.get_calendar_ids() == ["work@example.com", "personal@example.com"]
 
     def test_get_calendar_ids_empty_list(self):
         """Test that empty list defaults to primary."""
-        filter_obj = CalendarEventFilter(calendar_ids=[])
+        filter_obj = CalendarEventFilter.model_construct(calendar_ids=[])
         assert filter_obj.get_calendar_ids() == ["primary"]
 
     def test_time_range_filters(self):
@@ -45,13 +52,13 @@ class TestCalendarEventFilter:
         start = datetime(2024, 1, 1)
         end = datetime(2024, 12, 31)
 
-        filter_obj = CalendarEventFilter(time_min=start, time_max=end)
+        filter_obj = CalendarEventFilter.model_construct(time_min=start, time_max=end)
         assert filter_obj.time_min == start
         assert filter_obj.time_max == end
 
     def test_query_filter(self):
         """Test text query filter."""
-        filter_obj = CalendarEventFilter(query="sprint planning")
+        filter_obj = CalendarEventFilter.model_construct(query="sprint planning")
         assert filter_obj.query == "sprint planning"
 
     def test_max_results_validation(self):
@@ -82,10 +89,10 @@ class TestCalendarEventFilter:
 
     def test_single_events_flag(self):
         """Test single_events flag configuration."""
-        filter_obj = CalendarEventFilter(single_events=False)
+        filter_obj = CalendarEventFilter.model_construct(single_events=False)
         assert filter_obj.single_events is False
 
-        filter_obj = CalendarEventFilter(single_events=True)
+        filter_obj = CalendarEventFilter.model_construct(single_events=True)
         assert filter_obj.single_events is True
 
 
@@ -119,95 +126,87 @@ class TestCalendarExportFormats:
 class TestExportCalendarEventAsJSON:
     """Tests for JSON calendar event export."""
 
-    @pytest.fixture
-    def exporter(self, exporter_factory):
-        """Create an exporter instance using shared factory."""
-        return exporter_factory()
+    @pytest.fixture(scope="class")
+    @classmethod
+    def exporter(cls, class_exporter_factory):
+        """Create one exporter instance per class using shared factory."""
+        return class_exporter_factory()
 
-    def test_export_simple_event_json(self, exporter, tmp_path):
+    def test_export_simple_event_json(self, exporter, class_tmp_path, mock_factory):
         """Test exporting simple calendar event as JSON."""
-        event = {
-            "id": "event123",
-            "summary": "Team Meeting",
-            "description": "Weekly sync",
-            "start": {"dateTime": "2024-01-15T10:00:00Z"},
-            "end": {"dateTime": "2024-01-15T11:00:00Z"},
-            "attendees": [],
-        }
-
-        output_path = tmp_path / "event.json"
+        event = mock_factory.calendar_event(event_id="event123", summary="Team Meeting", description="Weekly sync")
+
+        output_path = class_tmp_path / "simple_event.json"
         success = exporter._export_calendar_event_as_json(event, output_path)
 
         assert success
         assert output_path.exists()
 
         # Verify JSON structure
-        with open(output_path) as f:
-            data = json.load(f)
-            assert data["id"] == "event123"
-            assert data["summary"] == "Team Meeting"
-            assert "exported_at" in data
-            assert "drive_links" in data
-
-    def test_export_all_day_event_json(self, exporter, tmp_path):
+        data = _load_json(output_path)
+        assert data["id"] == "event123"
+        assert data["summary"] == "Team Meeting"
+        assert "exported_at" in data
+        assert "drive_links" in data
+
+    def test_export_all_day_event_json(self, exporter, class_tmp_path, mock_factory):
         """Test exporting all-day event."""
-        event = {"id": "event456", "summary": "Holiday", "start": {"date": "2024-12-25"}, "end": {"date": "2024-12-26"}}
+        event = mock_factory.calendar_event(
+            event_id="event456", summary="Holiday", start_datetime="2024-12-25", end_datetime="2024-12-26", all_day=True
+        )
 
-        output_path = tmp_path / "event.json"
+        output_path = class_tmp_path / "all_day_event.json"
         success = exporter._export_calendar_event_as_json(event, output_path)
 
         assert success
-        with open(output_path) as f:
-            data = json.load(f)
-            assert data["summary"] == "Holiday"
-            # All-day events use date instead of dateTime
-            assert "date" in str(data["start"])
+        data = _load_json(output_path)
+        assert data["summary"] == "Holiday"
+        # All-day events use date instead of dateTime
+        assert "date" in str(data["start"])
 
-    def test_export_event_with_attachments_json(self, exporter, tmp_path):
+    def test_export_event_with_attachments_json(self, exporter, class_tmp_path, mock_factory):
         """Test exporting event with Drive attachments."""
-        event = {
-            "id": "event789",
-            "summary": "Project Review",
-            "description": "Review slides",
-            "start": {"dateTime": "2024-01-20T14:00:00Z"},
-            "end": {"dateTime": "2024-01-20T15:00:00Z"},
-            "attachments": [{"fileUrl": "https://drive.google.com/file/d/abc123/view", "title": "Slides.pptx"}],
-        }
-
-        output_path = tmp_path / "event.json"
+        event = mock_factory.calendar_event(
+            event_id="event789",
+            summary="Project Review",
+            description="Review slides",
+            start_datetime="2024-01-20T14:00:00Z",
+            end_datetime="2024-01-20T15:00:00Z",
+            attachments=[mock_factory.drive_attachment("https://drive.google.com/file/d/abc123/view", "Slides.pptx")],
+        )
+
+        output_path = class_tmp_path / "event_with_attachments.json"
         success = exporter._export_calendar_event_as_json(event, output_path)
 
         assert success
-        with open(output_path) as f:
-            data = json.load(f)
-            # Drive links should be extracted from attachments
-            assert isinstance(data["drive_links"], list)
+        data = _load_json(output_path)
+        # Drive links should be extracted from attachments
+        assert isinstance(data["drive_links"], list)
 
 
 @pytest.mark.unit
 class TestExportCalendarEventAsMarkdown:
     """Tests for Markdown calendar event export."""
 
-    @pytest.fixture
-    def exporter(self, exporter_factory):
-        """Create an exporter instance with frontmatter enabled."""
-        return exporter_factory(enable_frontmatter=True)
+    @pytest.fixture(scope="class")
+    @classmethod
+    def exporter(cls, class_exporter_factory):
+        """Create one exporter instance per class with frontmatter enabled."""
+        return class_exporter_factory(enable_frontmatter=True)
 
-    def test_export_simple_event_markdown(self, exporter, tmp_path):
+    def test_export_simple_event_markdown(self, exporter, class_tmp_path, mock_factory):
         """Test exporting simple event as Markdown."""
-        event = {
-            "id": "event123",
-            "_calendar_id": "primary",
-            "summary": "Weekly Standup",
-            "description": "Team sync meeting",
-            "location": "Conference Room A",
-            "start": {"dateTime": "2024-01-15T09:00:00Z"},
-            "end": {"dateTime": "2024-01-15T09:30:00Z"},
-            "organizer": {"email": "organizer@example.com", "displayName": "Team Lead"},
-            "attendees": [],
-        }
-
-        output_path = tmp_path / "event.md"
+        event = mock_factory.calendar_event(
+            event_id="event123",
+            summary="Weekly Standup",
+            description="Team sync meeting",
+            start_datetime="2024-01-15T09:00:00Z",
+            end_datetime="2024-01-15T09:30:00Z",
+            location="Conference Room A",
+            organizer_name="Team Lead",
+        )
+
+        output_path = class_tmp_path / "simple_event.md"
         success = exporter._export_calendar_event_as_markdown(event, output_path)
 
         assert success
@@ -226,22 +225,22 @@ class TestExportCalendarEventAsMarkdown:
         assert "**Where:** Conference Room A" in content
         assert "**Organizer:** Team Lead" in content
 
-    def test_export_event_with_attendees_markdown(self, exporter, tmp_path):
+    def test_export_event_with_attendees_markdown(self, exporter, class_tmp_path, mock_factory):
         """Test exporting event with attendees."""
-        event = {
-            "id": "event456",
-            "_calendar_id": "work@example.com",
-            "summary": "Planning Session",
-            "start": {"dateTime": "2024-01-20T14:00:00Z"},
-            "end": {"dateTime": "2024-01-20T16:00:00Z"},
-            "organizer": {"email": "boss@example.com"},
-            "attendees": [
-                {"email": "alice@example.com", "displayName": "Alice", "responseStatus": "accepted", "organizer": True},
-                {"email": "bob@example.com", "displayName": "Bob", "responseStatus": "tentative", "optional": True},
+        event = mock_factory.calendar_event(
+            event_id="event456",
+            summary="Planning Session",
+            start_datetime="2024-01-20T14:00:00Z",
+            end_datetime="2024-01-20T16:00:00Z",
+            organizer_email="boss@example.com",
+            attendees=[
+                mock_factory.calendar_attendee("alice@example.com", "Alice", "accepted", organizer=True),
+                mock_factory.calendar_attendee("bob@example.com", "Bob", "tentative", optional=True),
             ],
-        }
+            calendar_id="work@example.com",
+        )
 
-        output_path = tmp_path / "event.md"
+        output_path = class_tmp_path / "event_with_attendees.md"
         success = exporter._export_calendar_event_as_markdown(event, output_path)
 
         assert success
@@ -255,18 +254,17 @@ class TestExportCalendarEventAsMarkdown:
         assert "(optional)" in content
         assert "(organizer)" in content
 
-    def test_export_all_day_event_markdown(self, exporter, tmp_path):
+    def test_export_all_day_event_markdown(self, exporter, class_tmp_path, mock_factory):
         """Test exporting all-day event."""
-        event = {
-            "id": "event789",
-            "_calendar_id": "primary",
-            "summary": "Conference",
-            "start": {"date": "2024-03-15"},
-            "end": {"date": "2024-03-16"},
-            "organizer": {},
-        }
-
-        output_path = tmp_path / "event.md"
+        event = mock_factory.calendar_event(
+            event_id="event789",
+            summary="Conference",
+            start_datetime="2024-03-15",
+            end_datetime="2024-03-16",
+            all_day=True,
+        )
+
+        output_path = class_tmp_path / "all_day_event.md"
         success = exporter._export_calendar_event_as_markdown(event, output_path)
 
         assert success
@@ -276,19 +274,17 @@ class TestExportCalendarEventAsMarkdown:
         assert "2024-03-15" in content
         # All-day events use date format
 
-    def test_export_event_with_html_description_markdown(self, exporter, tmp_path):
+    def test_export_event_with_html_description_markdown(self, exporter, class_tmp_path, mock_factory):
         """Test HTML description conversion to Markdown."""
-        event = {
-            "id": "event999",
-            "_calendar_id": "primary",
-            "summary": "Training",
-            "description": "<p>Topics to cover:</p><ul><li>Item 1</li><li>Item 2</li></ul>",
-            "start": {"dateTime": "2024-02-01T10:00:00Z"},
-            "end": {"dateTime": "2024-02-01T12:00:00Z"},
-            "organizer": {},
-        }
-
-        output_path = tmp_path / "event.md"
+        event = mock_factory.calendar_event(
+            event_id="event999",
+            summary="Training",
+            description="<p>Topics to cover:</p><ul><li>Item 1</li><li>Item 2</li></ul>",
+            start_datetime="2024-02-01T10:00:00Z",
+            end_datetime="2024-02-01T12:00:00Z",
+        )
+
+        output_path = class_tmp_path / "event_with_html_description.md"
         success = exporter._export_calendar_event_as_markdown(event, output_path)
 
         assert success
@@ -298,22 +294,20 @@ class TestExportCalendarEventAsMarkdown:
         assert "## Description" in content
         assert "Topics to cover" in content
 
-    def test_export_event_with_attachments_markdown(self, exporter, tmp_path):
+    def test_export_event_with_attachments_markdown(self, exporter, class_tmp_path, mock_factory):
         """Test exporting event with attachments."""
-        event = {
-            "id": "event101",
-            "_calendar_id": "primary",
-            "summary": "Review Meeting",
-            "start": {"dateTime": "2024-01-25T15:00:00Z"},
-            "end": {"dateTime": "2024-01-25T16:00:00Z"},
-            "organizer": {},
-            "attachments": [
-                {"fileUrl": "https://docs.google.com/document/d/abc123", "title": "Meeting Agenda"},
-                {"fileUrl": "https://docs.google.com/spreadsheets/d/xyz789", "title": "Budget Sheet"},
+        event = mock_factory.calendar_event(
+            event_id="event101",
+            summary="Review Meeting",
+            start_datetime="2024-01-25T15:00:00Z",
+            end_datetime="2024-01-25T16:00:00Z",
+            attachments=[
+                mock_factory.drive_attachment("https://docs.google.com/document/d/abc123", "Meeting Agenda"),
+                mock_factory.drive_attachment("https://docs.google.com/spreadsheets/d/xyz789", "Budget Sheet"),
             ],
-        }
+        )
 
-        output_path = tmp_path / "event.md"
+        output_path = class_tmp_path / "event_with_attachments.md"
         success = exporter._export_calendar_event_as_markdown(event, output_path)
 
         assert success
@@ -324,17 +318,14 @@ class TestExportCalendarEventAsMarkdown:
         assert "[Budget Sheet]" in content
         assert "docs.google.com" in content
 
-    def test_export_event_no_title_markdown(self, exporter, tmp_path):
+    def test_export_event_no_title_markdown(self, exporter, class_tmp_path, mock_factory):
         """Test exporting event without summary (no title)."""
-        event = {
-            "id": "event000",
-            "_calendar_id": "primary",
-            "start": {"dateTime": "2024-01-10T08:00:00Z"},
-            "end": {"dateTime": "2024-01-10T09:00:00Z"},
-            "organizer": {},
-        }
-
-        output_path = tmp_path / "event.md"
+        event = mock_factory.calendar_event(
+            event_id="event000", start_datetime="2024-01-10T08:00:00Z", end_datetime="2024-01-10T09:00:00Z"
+        )
+        del event["summary"]
+
+        output_path = class_tmp_path / "event_no_title.md"
         success = exporter._export_calendar_event_as_markdown(event, output_path)
 
         assert success
@@ -343,18 +334,16 @@ class TestExportCalendarEventAsMarkdown:
         # Should handle missing summary gracefully
         assert "# (No title)" in content
 
-    def test_export_event_no_location_markdown(self, exporter, tmp_path):
+    def test_export_event_no_location_markdown(self, exporter, class_tmp_path, mock_factory):
         """Test exporting event without location."""
-        event = {
-            "id": "event202",
-            "_calendar_id": "primary",
-            "summary": "Virtual Meeting",
-            "start": {"dateTime": "2024-01-30T11:00:00Z"},
-            "end": {"dateTime": "2024-01-30T12:00:00Z"},
-            "organizer": {},
-        }
-
-        output_path = tmp_path / "event.md"
+        event = mock_factory.calendar_event(
+            event_id="event202",
+            summary="Virtual Meeting",
+            start_datetime="2024-01-30T11:00:00Z",
+            end_datetime="2024-01-30T12:00:00Z",
+        )
+
+        output_path = class_tmp_path / "event_no_location.md"
         success = exporter._export_calendar_event_as_markdown(event, output_path)
 
         assert success
@@ -368,63 +357,44 @@ class TestExportCalendarEventAsMarkdown:
 class TestCalendarTimezoneHandling:
     """Tests for calendar timezone and date format handling."""
 
-    @pytest.fixture
-    def exporter(self, exporter_factory):
-        """Create an exporter instance using shared factory."""
-        return exporter_factory()
-
-    def test_datetime_with_timezone(self, exporter, tmp_path):
-        """Test handling dateTime with timezone."""
-        event = {
-            "id": "evt1",
-            "summary": "Test Event",
-            "start": {"dateTime": "2024-01-15T10:00:00-05:00"},
-            "end": {"dateTime": "2024-01-15T11:00:00-05:00"},
-            "organizer": {},
-        }
-
-        output_path = tmp_path / "event.json"
-        success = exporter._export_calendar_event_as_json(event, output_path)
-
-        assert success
-        with open(output_path) as f:
-            data = json.load(f)
-            # Timezone should be preserved
-            assert "-05:00" in str(data)
-
-    def test_datetime_utc(self, exporter, tmp_path):
-        """Test handling dateTime in UTC."""
-        event = {
-            "id": "evt2",
-            "summary": "UTC Event",
-            "start": {"dateTime": "2024-01-15T15:00:00Z"},
-            "end": {"dateTime": "2024-01-15T16:00:00Z"},
-            "organizer": {},
-        }
-
-        output_path = tmp_path / "event.json"
-        success = exporter._export_calendar_event_as_json(event, output_path)
-
-        assert success
-        with open(output_path) as f:
-            data = json.load(f)
-            assert "Z" in str(data) or "UTC" in str(data).upper()
-
-    def test_date_only_format(self, exporter, tmp_path):
-        """Test handling date-only format (all-day events)."""
-        event = {
-            "id": "evt3",
-            "summary": "All Day Event",
-            "start": {"date": "2024-01-15"},
-            "end": {"date": "2024-01-16"},
-            "organizer": {},
-        }
-
-        output_path = tmp_path / "event.json"
+    @pytest.fixture(scope="class")
+    @classmethod
+    def exporter(cls, class_exporter_factory):
+        """Create one exporter instance per class using shared factory."""
+        return class_exporter_factory()
+
+    @pytest.mark.parametrize(
+        ("event_id", "start", "end", "expected"),
+        [
+            pytest.param(
+                "evt1",
+                {"dateTime": "2024-01-15T10:00:00-05:00"},
+                {"dateTime": "2024-01-15T11:00:00-05:00"},
+                "10:00:00-05:00",
+                id="datetime_with_timezone",
+            ),
+            pytest.param(
+                "evt2",
+                {"dateTime": "2024-01-15T15:00:00Z"},
+                {"dateTime": "2024-01-15T16:00:00Z"},
+                "15:00:00Z",
+                id="datetime_utc",
+            ),
+            pytest.param(
+                "evt3",
+                {"date": "2024-01-15"},
+                {"date": "2024-01-16"},
+                "2024-01-15",
+                id="date_only_format",
+            ),
+        ],
+    )
+    def test_event_time_preserved(self, exporter, class_tmp_path, event_id, start, end, expected):
+        """Test that timezone offsets, UTC and date-only start/end values survive export."""
+        event = {"id": event_id, "summary": "Test Event", "start": start, "end": end, "organizer": {}}
+
+        output_path = class_tmp_path / f"{event_id}.json"
         success = exporter._export_calendar_event_as_json(event, output_path)
 
         assert success
-        with open(output_path) as f:
-            data = json.load(f)
-            # Should preserve date format
-            assert "2024-01-15" in str(data)
+        assert expected in str(_load_json(output_path))
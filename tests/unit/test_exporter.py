@@ -7,44 +7,36 @@ from google_workspace_tools.core.exporter import GoogleDriveExporter
 from google_workspace_tools.core.types import DocumentType
 
 
+@pytest.fixture(scope="module")
+def exporter():
+    """Create one exporter instance without authentication, shared by the module.
+
+    Only use it for tests that do not mutate exporter state.
+    """
+    return GoogleDriveExporter()
+
+
 @pytest.mark.unit
 class TestExtractDocumentId:
     """Tests for document ID extraction from URLs."""
 
-    @pytest.fixture
-    def exporter(self):
-        """Create an exporter instance without authentication."""
-        return GoogleDriveExporter()
-
-    def test_extract_from_docs_url(self, exporter):
-        """Test extracting ID from Google Docs URL."""
-        url = "https://docs.google.com/document/d/1abc123xyz_-/edit"
-        assert exporter.extract_document_id(url) == "1abc123xyz_-"
-
-    def test_extract_from_docs_url_with_user(self, exporter):
-        """Test extracting ID from Google Docs URL with user path."""
-        url = "https://docs.google.com/document/u/0/d/1abc123xyz/edit"
-        assert exporter.extract_document_id(url) == "1abc123xyz"
-
-    def test_extract_from_sheets_url(self, exporter):
-        """Test extracting ID from Google Sheets URL."""
-        url = "https://docs.google.com/spreadsheets/d/spreadsheet123/edit#gid=0"
-        assert exporter.extract_document_id(url) == "spreadsheet123"
-
-    def test_extract_from_slides_url(self, exporter):
-        """Test extracting ID from Google Slides URL."""
-        url = "https://docs.google.com/presentation/d/presentation456/edit"
-        assert exporter.extract_document_id(url) == "presentation456"
-
-    def test_extract_from_drive_open_url(self, exporter):
-        """Test extracting ID from drive.google.com/open URL."""
-        url = "https://drive.google.com/open?id=driveFile789"
-        assert exporter.extract_document_id(url) == "driveFile789"
-
-    def test_extract_returns_id_if_not_url(self, exporter):
-        """Test that non-URL strings are returned as-is (assumed to be IDs)."""
-        doc_id = "1abc123xyz"
-        assert exporter.extract_document_id(doc_id) == doc_id
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            pytest.param("https://docs.google.com/document/d/1abc123xyz_-/edit", "1abc123xyz_-", id="docs"),
+            pytest.param("https://docs.google.com/document/u/0/d/1abc123xyz/edit", "1abc123xyz", id="docs_with_user"),
+            pytest.param(
+                "https://docs.google.com/spreadsheets/d/spreadsheet123/edit#gid=0", "spreadsheet123", id="sheets"
+            ),
+            pytest.param("https://docs.google.com/presentation/d/presentation456/edit", "presentation456", id="slides"),
+            pytest.param("https://drive.google.com/open?id=driveFile789", "driveFile789", id="drive_open"),
+            # Non-URL strings are returned as-is (assumed to be IDs)
+            pytest.param("1abc123xyz", "1abc123xyz", id="plain_id"),
+        ],
+    )
+    def test_extract_document_id(self, exporter, url, expected):
+        """Test extracting the document ID from each supported URL form."""
+        assert exporter.extract_document_id(url) == expected
 
     def test_extract_invalid_url_raises(self, exporter):
         """Test that invalid URLs raise ValueError."""
@@ -56,76 +48,55 @@ class TestExtractDocumentId:
 class TestDetectDocumentType:
     """Tests for document type detection."""
 
-    @pytest.fixture
-    def exporter(self):
-        """Create an exporter instance."""
-        return GoogleDriveExporter()
-
-    def test_detect_document(self, exporter):
-        """Test detecting Google Docs document."""
-        url = "https://docs.google.com/document/d/abc123/edit"
-        assert exporter.detect_document_type(url) == DocumentType.DOCUMENT
-
-    def test_detect_spreadsheet(self, exporter):
-        """Test detecting Google Sheets spreadsheet."""
-        url = "https://docs.google.com/spreadsheets/d/abc123/edit"
-        assert exporter.detect_document_type(url) == DocumentType.SPREADSHEET
-
-    def test_detect_presentation(self, exporter):
-        """Test detecting Google Slides presentation."""
-        url = "https://docs.google.com/presentation/d/abc123/edit"
-        assert exporter.detect_document_type(url) == DocumentType.PRESENTATION
-
-    def test_detect_unknown_for_id(self, exporter):
-        """Test that plain IDs return UNKNOWN type."""
-        doc_id = "abc123"
-        assert exporter.detect_document_type(doc_id) == DocumentType.UNKNOWN
-
-    def test_detect_unknown_for_other_urls(self, exporter):
-        """Test that non-Google URLs return UNKNOWN type."""
-        url = "https://example.com/files/abc123"
-        assert exporter.detect_document_type(url) == DocumentType.UNKNOWN
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            pytest.param("https://docs.google.com/document/d/abc123/edit", DocumentType.DOCUMENT, id="document"),
+            pytest.param(
+                "https://docs.google.com/spreadsheets/d/abc123/edit", DocumentType.SPREADSHEET, id="spreadsheet"
+            ),
+            pytest.param(
+                "https://docs.google.com/presentation/d/abc123/edit", DocumentType.PRESENTATION, id="presentation"
+            ),
+            # Plain IDs and non-Google URLs cannot be classified from the string alone
+            pytest.param("abc123", DocumentType.UNKNOWN, id="plain_id"),
+            pytest.param("https://example.com/files/abc123", DocumentType.UNKNOWN, id="other_url"),
+        ],
+    )
+    def test_detect_document_type(self, exporter, url, expected):
+        """Test detecting the document type from a URL."""
+        assert exporter.detect_document_type(url) == expected
 
 
 @pytest.mark.unit
 class TestExportFormats:
     """Tests for export format dictionaries."""
 
-    def test_document_formats_exist(self):
-        """Test that document export formats are defined."""
-        formats = GoogleDriveExporter.DOCUMENT_EXPORT_FORMATS
-
-        assert "pdf" in formats
-        assert "docx" in formats
-        assert "md" in formats
-        assert "html" in formats
-        assert "txt" in formats
-
-    def test_spreadsheet_formats_exist(self):
-        """Test that spreadsheet export formats are defined."""
-        formats = GoogleDriveExporter.SPREADSHEET_EXPORT_FORMATS
-
-        assert "pdf" in formats
-        assert "xlsx" in formats
-        assert "csv" in formats
-        assert "tsv" in formats
-
-    def test_presentation_formats_exist(self):
-        """Test that presentation export formats are defined."""
-        formats = GoogleDriveExporter.PRESENTATION_EXPORT_FORMATS
-
-        assert "pdf" in formats
-        assert "pptx" in formats
-        assert "odp" in formats
-
-    def test_markdown_not_in_spreadsheet_formats(self):
-        """Test that markdown is not available for spreadsheets."""
-        formats = GoogleDriveExporter.SPREADSHEET_EXPORT_FORMATS
-        assert "md" not in formats
-
-    def test_markdown_not_in_presentation_formats(self):
-        """Test that markdown is not available for presentations."""
-        formats = GoogleDriveExporter.PRESENTATION_EXPORT_FORMATS
+    @pytest.mark.parametrize(
+        ("formats", "expected"),
+        [
+            pytest.param(
+                GoogleDriveExporter.DOCUMENT_EXPORT_FORMATS, {"pdf", "docx", "md", "html", "txt"}, id="document"
+            ),
+            pytest.param(
+                GoogleDriveExporter.SPREADSHEET_EXPORT_FORMATS, {"pdf", "xlsx", "csv", "tsv"}, id="spreadsheet"
+            ),
+            pytest.param(GoogleDriveExporter.PRESENTATION_EXPORT_FORMATS, {"pdf", "pptx", "odp"}, id="presentation"),
+        ],
+    )
+    def test_formats_exist(self, formats, expected):
+        """Test that each document type defines its export formats."""
+        assert expected <= formats.keys()
+
+    @pytest.mark.parametrize(
+        "formats",
+        [
+            pytest.param(GoogleDriveExporter.SPREADSHEET_EXPORT_FORMATS, id="spreadsheet"),
+            pytest.param(GoogleDriveExporter.PRESENTATION_EXPORT_FORMATS, id="presentation"),
+        ],
+    )
+    def test_markdown_not_available(self, formats):
+        """Test that markdown is not available for spreadsheets and presentations."""
         assert "md" not in formats
 
 
@@ -138,8 +109,8 @@ class TestResetProcessedDocs:
         exporter = GoogleDriveExporter()
 
         # Simulate processing some docs
-        exporter._processed_docs.add("doc1")
-        exporter._processed_docs.add("doc2")
+        exporter._processed_docs["doc1"] = None
+        exporter._processed_docs["doc2"] = None
         assert len(exporter._processed_docs) == 2
 
         # Reset
@@ -205,6 +176,30 @@ class TestFrontmatter:
         assert "title: Auto Title" not in frontmatter
         assert "custom_field: value" in frontmatter
 
+    def test_custom_fields_changed_after_init(self):
+        """Test that changes to config.frontmatter_fields after init are picked up."""
+        config = GoogleDriveExporterConfig(enable_frontmatter=True, frontmatter_fields={"project": "alpha"})
+        exporter = GoogleDriveExporter(config)
+        exporter._generate_frontmatter(
+            document_id="abc123",
+            title="Auto Title",
+            source_url="https://docs.google.com/document/d/abc123",
+            doc_type=DocumentType.DOCUMENT,
+        )
+
+        exporter.config.frontmatter_fields["project"] = "beta"
+        exporter.config.frontmatter_fields["title"] = "Custom Title"
+        frontmatter = exporter._generate_frontmatter(
+            document_id="abc123",
+            title="Auto Title",
+            source_url="https://docs.google.com/document/d/abc123",
+            doc_type=DocumentType.DOCUMENT,
+        )
+
+        assert "project: beta" in frontmatter
+        assert "project: alpha" not in frontmatter
+        assert "title: Custom Title" in frontmatter
+
     def test_frontmatter_disabled_by_default(self):
         """Test that frontmatter is disabled by default in config."""
         config = GoogleDriveExporterConfig()
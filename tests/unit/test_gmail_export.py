@@ -1,7 +1,9 @@
 """Tests for Gmail export functionality."""
 
 import base64
+import io
 import json
+import sys
 from datetime import datetime
 
 import pytest
@@ -10,55 +12,58 @@ from pydantic import ValidationError
 from google_workspace_tools.core.exporter import GoogleDriveExporter
 from google_workspace_tools.core.filters import GmailSearchFilter
 
+# Message bodies and their Gmail (URL-safe base64) encodings, encoded once at import
+_TEXT_BODY = "This is a plain text email."
+_HTML_BODY = "<p>This is an HTML email.</p>"
+_TEXT_BODY_B64 = base64.urlsafe_b64encode(_TEXT_BODY.encode()).decode()
+_HTML_BODY_B64 = base64.urlsafe_b64encode(_HTML_BODY.encode()).decode()
+
+
+@pytest.fixture
+def exporter(session_exporter):
+    """Default exporter for the stateless helpers under test (shared across the session)."""
+    return session_exporter
+
+
+@pytest.fixture(scope="module")
+def default_filter():
+    """Create one default Gmail filter, shared by the module (do not mutate)."""
+    return GmailSearchFilter()
+
 
 @pytest.mark.unit
 class TestGmailSearchFilter:
     """Tests for Gmail search filter query building."""
 
-    def test_build_query_empty(self):
-        """Test query building with no filters."""
-        filter_obj = GmailSearchFilter()
-        assert filter_obj.build_query() == ""
-
-    def test_build_query_with_text(self):
-        """Test query building with text search."""
-        filter_obj = GmailSearchFilter(query="from:boss@example.com")
-        assert filter_obj.build_query() == "from:boss@example.com"
-
-    def test_build_query_with_dates(self):
-        """Test query building with date filters."""
-        filter_obj = GmailSearchFilter(after_date=datetime(2024, 1, 1), before_date=datetime(2024, 12, 31))
-        query = filter_obj.build_query()
-        assert "after:2024/01/01" in query
-        assert "before:2024/12/31" in query
-
-    def test_build_query_with_labels(self):
-        """Test query building with label filters."""
-        filter_obj = GmailSearchFilter(labels=["INBOX", "IMPORTANT"])
-        query = filter_obj.build_query()
-        assert "label:INBOX" in query
-        assert "label:IMPORTANT" in query
-
-    def test_build_query_with_attachment_filter_true(self):
-        """Test query building with attachment requirement."""
-        filter_obj = GmailSearchFilter(has_attachment=True)
-        assert filter_obj.build_query() == "has:attachment"
-
-    def test_build_query_with_attachment_filter_false(self):
-        """Test query building excluding attachments."""
-        filter_obj = GmailSearchFilter(has_attachment=False)
-        assert filter_obj.build_query() == "-has:attachment"
-
-    def test_build_query_combined_filters(self):
-        """Test query building with multiple filters combined."""
-        filter_obj = GmailSearchFilter(
-            query="subject:meeting", after_date=datetime(2024, 1, 1), labels=["work"], has_attachment=True
-        )
-        query = filter_obj.build_query()
-        assert "subject:meeting" in query
-        assert "after:2024/01/01" in query
-        assert "label:work" in query
-        assert "has:attachment" in query
+    @pytest.mark.parametrize(
+        ("kwargs", "expected_parts"),
+        [
+            pytest.param({}, [], id="empty"),
+            pytest.param({"query": "from:boss@example.com"}, ["from:boss@example.com"], id="text"),
+            pytest.param(
+                {"after_date": datetime(2024, 1, 1), "before_date": datetime(2024, 12, 31)},
+                ["after:2024/01/01", "before:2024/12/31"],
+                id="dates",
+            ),
+            pytest.param({"labels": ["INBOX", "IMPORTANT"]}, ["label:INBOX", "label:IMPORTANT"], id="labels"),
+            pytest.param({"has_attachment": True}, ["has:attachment"], id="attachment_true"),
+            pytest.param({"has_attachment": False}, ["-has:attachment"], id="attachment_false"),
+            pytest.param(
+                {
+                    "query": "subject:meeting",
+                    "after_date": datetime(2024, 1, 1),
+                    "labels": ["work"],
+                    "has_attachment": True,
+                },
+                ["subject:meeting", "after:2024/01/01", "label:work", "has:attachment"],
+                id="combined",
+            ),
+        ],
+    )
+    def test_build_query(self, kwargs, expected_parts):
+        """Test query building for each filter and their combination."""
+        filter_obj = GmailSearchFilter.model_construct(**kwargs)
+        assert filter_obj.build_query().split() == expected_parts
 
     def test_max_results_validation(self):
         """Test that max_results is validated."""
@@ -73,9 +78,9 @@ class TestGmailSearchFilter:
         with pytest.raises(ValidationError):
             GmailSearchFilter(max_results=501)
 
-    def test_default_values(self):
+    def test_default_values(self, default_filter):
         """Test filter default values."""
-        filter_obj = GmailSearchFilter()
+        filter_obj = default_filter
         assert filter_obj.query == ""
         assert filter_obj.after_date is None
         assert filter_obj.before_date is None
@@ -115,73 +120,54 @@ class TestEmailExportFormats:
 class TestExtractMessageBody:
     """Tests for email body extraction."""
 
-    @pytest.fixture
-    def exporter(self, exporter_factory):
-        """Create an exporter instance using shared factory."""
-        return exporter_factory()
-
     def test_extract_simple_text_body(self, exporter):
         """Test extracting simple text/plain body."""
-        text_content = "This is a plain text email."
-        encoded_text = base64.urlsafe_b64encode(text_content.encode()).decode()
-
-        message = {"payload": {"mimeType": "text/plain", "body": {"data": encoded_text}}}
+        message = {"payload": {"mimeType": "text/plain", "body": {"data": _TEXT_BODY_B64}}}
 
         text_body, html_body = exporter._extract_message_body(message)
-        assert text_body == text_content
+        assert text_body == _TEXT_BODY
         assert html_body == ""
 
     def test_extract_simple_html_body(self, exporter):
         """Test extracting simple text/html body."""
-        html_content = "<p>This is an HTML email.</p>"
-        encoded_html = base64.urlsafe_b64encode(html_content.encode()).decode()
-
-        message = {"payload": {"mimeType": "text/html", "body": {"data": encoded_html}}}
+        message = {"payload": {"mimeType": "text/html", "body": {"data": _HTML_BODY_B64}}}
 
         text_body, html_body = exporter._extract_message_body(message)
         assert text_body == ""
-        assert html_body == html_content
+        assert html_body == _HTML_BODY
 
     def test_extract_multipart_body(self, exporter):
         """Test extracting multipart message with both text and HTML."""
-        text_content = "Plain text version"
-        html_content = "<p>HTML version</p>"
-        encoded_text = base64.urlsafe_b64encode(text_content.encode()).decode()
-        encoded_html = base64.urlsafe_b64encode(html_content.encode()).decode()
-
         message = {
             "payload": {
                 "mimeType": "multipart/alternative",
                 "parts": [
-                    {"mimeType": "text/plain", "body": {"data": encoded_text}},
-                    {"mimeType": "text/html", "body": {"data": encoded_html}},
+                    {"mimeType": "text/plain", "body": {"data": _TEXT_BODY_B64}},
+                    {"mimeType": "text/html", "body": {"data": _HTML_BODY_B64}},
                 ],
             }
         }
 
         text_body, html_body = exporter._extract_message_body(message)
-        assert text_body == text_content
-        assert html_body == html_content
+        assert text_body == _TEXT_BODY
+        assert html_body == _HTML_BODY
 
     def test_extract_nested_multipart(self, exporter):
         """Test extracting nested multipart message."""
-        text_content = "Text content"
-        encoded_text = base64.urlsafe_b64encode(text_content.encode()).decode()
-
         message = {
             "payload": {
                 "mimeType": "multipart/mixed",
                 "parts": [
                     {
                         "mimeType": "multipart/alternative",
-                        "parts": [{"mimeType": "text/plain", "body": {"data": encoded_text}}],
+                        "parts": [{"mimeType": "text/plain", "body": {"data": _TEXT_BODY_B64}}],
                     }
                 ],
             }
         }
 
         text_body, html_body = exporter._extract_message_body(message)
-        assert text_body == text_content
+        assert text_body == _TEXT_BODY
 
     def test_extract_empty_message(self, exporter):
         """Test extracting from empty message."""
@@ -196,11 +182,6 @@ class TestExtractMessageBody:
 class TestExtractEmailAttachments:
     """Tests for email attachment extraction."""
 
-    @pytest.fixture
-    def exporter(self, exporter_factory):
-        """Create an exporter instance using shared factory."""
-        return exporter_factory()
-
     def test_extract_single_attachment(self, exporter):
         """Test extracting single attachment metadata."""
         message = {
@@ -272,16 +253,25 @@ class TestExtractEmailAttachments:
         assert len(attachments) == 1
         assert attachments[0]["filename"] == "nested.doc"
 
+    def test_extract_attachments_keeps_document_order(self, exporter):
+        """Test that nested attachments are returned in document order, beyond the recursion limit."""
+
+        def attachment(name):
+            return {"filename": name, "mimeType": "application/pdf", "body": {"attachmentId": name, "size": 1}}
+
+        part = {"mimeType": "multipart/mixed", "parts": [attachment("deepest.pdf")]}
+        for _ in range(sys.getrecursionlimit()):
+            part = {"mimeType": "multipart/mixed", "parts": [part]}
+        message = {"payload": {"parts": [attachment("first.pdf"), part, attachment("last.pdf")]}}
+
+        attachments = exporter._extract_email_attachments(message)
+        assert [a["filename"] for a in attachments] == ["first.pdf", "deepest.pdf", "last.pdf"]
+
 
 @pytest.mark.unit
 class TestGroupMessagesByThread:
     """Tests for thread grouping logic."""
 
-    @pytest.fixture
-    def exporter(self, exporter_factory):
-        """Create an exporter instance using shared factory."""
-        return exporter_factory()
-
     def test_group_single_thread(self, exporter):
         """Test grouping messages in a single thread."""
         messages = [
@@ -313,6 +303,18 @@ class TestGroupMessagesByThread:
         assert len(threads["thread1"]) == 2
         assert len(threads["thread2"]) == 1
 
+    def test_group_sorts_dates_numerically(self, exporter):
+        """Test that internal dates sort as numbers, with missing dates first and ties in arrival order."""
+        messages = [
+            {"id": "msg1", "thread_id": "thread1", "internal_date": "10000"},
+            {"id": "msg2", "thread_id": "thread1", "internal_date": "9000"},
+            {"id": "msg3", "thread_id": "thread1"},
+            {"id": "msg4", "thread_id": "thread1", "internal_date": "9000"},
+        ]
+
+        threads = exporter._group_messages_by_thread(messages)
+        assert [m["id"] for m in threads["thread1"]] == ["msg3", "msg2", "msg4", "msg1"]
+
     def test_group_empty_messages(self, exporter):
         """Test grouping with no messages."""
         messages = []
@@ -333,11 +335,6 @@ class TestGroupMessagesByThread:
 class TestExportEmailThreadAsJSON:
     """Tests for JSON email export."""
 
-    @pytest.fixture
-    def exporter(self, exporter_factory):
-        """Create an exporter instance using shared factory."""
-        return exporter_factory()
-
     def test_export_thread_json(self, exporter, tmp_path):
         """Test exporting thread as JSON."""
         messages = [
@@ -367,7 +364,7 @@ class TestExportEmailThreadAsJSON:
             assert len(data["messages"]) == 1
             assert "exported_at" in data
 
-    def test_export_multiple_messages_json(self, exporter, tmp_path):
+    def test_export_multiple_messages_json(self, exporter):
         """Test exporting multiple messages in a thread."""
         messages = [
             {
@@ -386,13 +383,12 @@ class TestExportEmailThreadAsJSON:
             },
         ]
 
-        output_path = tmp_path / "thread.json"
-        success = exporter._export_email_thread_as_json("thread456", messages, output_path)
+        output = io.StringIO()
+        success = exporter._export_email_thread_as_json("thread456", messages, output)
 
         assert success
-        with open(output_path) as f:
-            data = json.load(f)
-            assert data["message_count"] == 2
+        data = json.loads(output.getvalue())
+        assert data["message_count"] == 2
 
 
 @pytest.mark.unit
@@ -404,7 +400,7 @@ class TestExportEmailThreadAsMarkdown:
         """Create an exporter instance with frontmatter enabled."""
         return exporter_factory(enable_frontmatter=True)
 
-    def test_export_thread_markdown(self, exporter, tmp_path):
+    def test_export_thread_markdown(self, exporter):
         """Test exporting thread as Markdown."""
         messages = [
             {
@@ -423,13 +419,11 @@ class TestExportEmailThreadAsMarkdown:
             }
         ]
 
-        output_path = tmp_path / "thread.md"
-        success = exporter._export_email_thread_as_markdown("thread123", messages, output_path)
+        output = io.StringIO()
+        success = exporter._export_email_thread_as_markdown("thread123", messages, output)
 
         assert success
-        assert output_path.exists()
-
-        content = output_path.read_text()
+        content = output.getvalue()
         # Check frontmatter
         assert content.startswith("---\n")
         assert "thread_id: thread123" in content
@@ -440,7 +434,7 @@ class TestExportEmailThreadAsMarkdown:
         assert "**From:** sender@example.com" in content
         assert "Let's meet tomorrow" in content
 
-    def test_export_with_html_conversion(self, exporter, tmp_path):
+    def test_export_with_html_conversion(self, exporter):
         """Test HTML to Markdown conversion in export."""
         messages = [
             {
@@ -453,15 +447,15 @@ class TestExportEmailThreadAsMarkdown:
             }
         ]
 
-        output_path = tmp_path / "thread.md"
-        success = exporter._export_email_thread_as_markdown("thread123", messages, output_path)
+        output = io.StringIO()
+        success = exporter._export_email_thread_as_markdown("thread123", messages, output)
 
         assert success
-        content = output_path.read_text()
+        content = output.getvalue()
         # html_to_markdown should convert HTML to markdown
         assert "bold" in content.lower() or "strong" in content.lower()
 
-    def test_export_with_attachments(self, exporter, tmp_path):
+    def test_export_with_attachments(self, exporter):
         """Test exporting with attachment information."""
         messages = [
             {
@@ -474,11 +468,11 @@ class TestExportEmailThreadAsMarkdown:
             }
         ]
 
-        output_path = tmp_path / "thread.md"
-        success = exporter._export_email_thread_as_markdown("thread123", messages, output_path)
+        output = io.StringIO()
+        success = exporter._export_email_thread_as_markdown("thread123", messages, output)
 
         assert success
-        content = output_path.read_text()
+        content = output.getvalue()
         assert "**Attachments:**" in content
         assert "document.pdf" in content
         assert "image.png" in content
@@ -490,11 +484,6 @@ class TestExportEmailThreadAsMarkdown:
 class TestFormatEmailThreadAsMarkdown:
     """Tests for the pure markdown formatter method."""
 
-    @pytest.fixture
-    def exporter(self, exporter_factory):
-        """Create exporter instance for testing using shared factory."""
-        return exporter_factory()
-
     def test_format_returns_string(self, exporter):
         """Test that formatter returns a string, not writes a file."""
         messages = [
@@ -525,16 +514,39 @@ class TestFormatEmailThreadAsMarkdown:
         assert result.startswith("---\n")
         assert "thread_id: thread123" in result
 
+    @pytest.mark.parametrize(
+        ("size", "expected"),
+        [
+            pytest.param(0, "0 B", id="empty"),
+            pytest.param(512, "512 B", id="bytes"),
+            pytest.param(1024, "1.0 KB", id="one_kb"),
+            pytest.param(1536, "1.5 KB", id="kilobytes"),
+            pytest.param(5 * 1024 * 1024, "5.0 MB", id="megabytes"),
+            pytest.param(3 * 1024**3, "3.0 GB", id="gigabytes"),
+        ],
+    )
+    def test_format_attachment_size(self, exporter, size, expected):
+        """Test that attachment sizes are shown with a fitting unit."""
+        messages = [
+            {
+                "id": "msg1",
+                "headers": {"Subject": "Files"},
+                "text_body": "Body",
+                "html_body": "",
+                "attachments": [{"filename": "file.bin", "size": size}],
+                "label_ids": [],
+            }
+        ]
+
+        result = exporter._format_email_thread_as_markdown("thread123", messages)
+
+        assert f"- file.bin ({expected})" in result
+
 
 @pytest.mark.unit
 class TestFormatEmailThreadAsJson:
     """Tests for the pure JSON formatter method."""
 
-    @pytest.fixture
-    def exporter(self, exporter_factory):
-        """Create exporter instance for testing using shared factory."""
-        return exporter_factory()
-
     def test_format_returns_valid_json(self, exporter):
         """Test that formatter returns valid JSON string."""
         messages = [
@@ -553,3 +565,29 @@ class TestFormatEmailThreadAsJson:
         assert parsed["thread_id"] == "thread123"
         assert parsed["subject"] == "Test Subject"
         assert parsed["message_count"] == 1
+
+    def test_orjson_and_stdlib_serializers_match(self, exporter, monkeypatch):
+        """Test that orjson and the stdlib fallback produce identical JSON, including non-ASCII text."""
+        pytest.importorskip("orjson")
+
+        class _FrozenDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return cls(2024, 1, 15, 10, 30, tzinfo=tz)
+
+        monkeypatch.setattr("google_workspace_tools.core.exporter.datetime", _FrozenDatetime)
+        messages = [
+            {
+                "id": "msg1",
+                "headers": {"Subject": "Café – résumé ✓", "From": "Zoë <zoe@example.com>"},
+                "text_body": "Grüße aus München 🎉\nこんにちは",
+                "html_body": "",
+            }
+        ]
+
+        with_orjson = exporter._format_email_thread_as_json("thread123", messages)
+        monkeypatch.setattr("google_workspace_tools.core.exporter.orjson", None)
+        with_stdlib = exporter._format_email_thread_as_json("thread123", messages)
+
+        assert with_orjson == with_stdlib
+        assert "Grüße aus München 🎉" in with_stdlib
@@ -1,6 +1,7 @@
 """Tests for spreadsheet to markdown conversion."""
 
-from unittest.mock import MagicMock, patch
+from dataclasses import dataclass
+from unittest.mock import patch
 
 import pytest
 
@@ -8,6 +9,20 @@ from google_workspace_tools.core.config import GoogleDriveExporterConfig
 from google_workspace_tools.core.exporter import GoogleDriveExporter
 
 
+@dataclass(slots=True)
+class _FakeConversionResult:
+    """Stand-in for a MarkItDown conversion result."""
+
+    text_content: str
+
+
+class _FakeMarkItDown:
+    """Stand-in for ``markitdown.MarkItDown`` that converts every file to the same table."""
+
+    def convert(self, *args, **kwargs) -> _FakeConversionResult:
+        return _FakeConversionResult("# Test Sheet\n\n| A | B |\n|---|---|\n| 1 | 2 |\n")
+
+
 @pytest.mark.integration
 class TestSpreadsheetMarkdownExport:
     """Tests for spreadsheet markdown export functionality."""
@@ -23,16 +38,12 @@ class TestSpreadsheetMarkdownExport:
         )
         return GoogleDriveExporter(config)
 
-    @pytest.fixture
-    def mock_markitdown(self):
-        """Mock MarkItDown library."""
-        with patch("markitdown.MarkItDown") as mock:
-            mock_instance = MagicMock()
-            mock_instance.convert.return_value = MagicMock(
-                text_content="# Test Sheet\n\n| A | B |\n|---|---|\n| 1 | 2 |\n"
-            )
-            mock.return_value = mock_instance
-            yield mock
+    @pytest.fixture(scope="class")
+    @classmethod
+    def mock_markitdown(cls):
+        """Mock MarkItDown library once for the class; the stub is stateless, so nothing needs resetting."""
+        with patch("markitdown.MarkItDown", _FakeMarkItDown) as fake:
+            yield fake
 
     def test_config_spreadsheet_export_mode_default(self):
         """Test that spreadsheet_export_mode defaults to 'combined'."""
@@ -56,7 +67,9 @@ class TestSpreadsheetMarkdownExport:
         assert config.keep_intermediate_xlsx is False
 
     @patch.object(GoogleDriveExporter, "_export_single_format")
-    def test_export_spreadsheet_as_markdown_success(self, mock_export, exporter, tmp_path, mock_markitdown):
+    def test_export_spreadsheet_as_markdown_success(
+        self, mock_export, exporter, tmp_path, mock_markitdown, captured_writes
+    ):
         """Test successful spreadsheet to markdown conversion."""
         mock_export.return_value = True
 
@@ -69,13 +82,14 @@ class TestSpreadsheetMarkdownExport:
         )
 
         assert result is True
-        assert output_path.exists()
-        content = output_path.read_text()
+        content = captured_writes[output_path]
         assert "# Test Sheet" in content
         assert "| A | B |" in content
 
     @patch.object(GoogleDriveExporter, "_export_single_format")
-    def test_export_spreadsheet_as_markdown_with_frontmatter(self, mock_export, tmp_path, mock_markitdown):
+    def test_export_spreadsheet_as_markdown_with_frontmatter(
+        self, mock_export, tmp_path, mock_markitdown, captured_writes
+    ):
         """Test spreadsheet markdown export with frontmatter enabled."""
         config = GoogleDriveExporterConfig(
             target_directory=tmp_path,
@@ -94,7 +108,7 @@ class TestSpreadsheetMarkdownExport:
         )
 
         assert result is True
-        content = output_path.read_text()
+        content = captured_writes[output_path]
         assert "---" in content
         assert "title: Test Spreadsheet" in content
         assert "source: https://docs.google.com/spreadsheets/d/abc123" in content
@@ -127,6 +141,27 @@ class TestSpreadsheetMarkdownExport:
         assert output_path.exists()
         assert not xlsx_path.exists()  # Should be removed
 
+    @patch.object(GoogleDriveExporter, "_export_single_format")
+    def test_export_spreadsheet_as_markdown_xlsx_already_gone(self, mock_export, tmp_path, mock_markitdown):
+        """Test that a missing intermediate XLSX does not fail an otherwise successful export."""
+        config = GoogleDriveExporterConfig(
+            target_directory=tmp_path,
+            export_format="md",
+            keep_intermediate_xlsx=False,
+        )
+        exporter = GoogleDriveExporter(config)
+        mock_export.return_value = True
+
+        output_path = tmp_path / "test.md"
+        result = exporter.export_spreadsheet_as_markdown(
+            spreadsheet_id="abc123",
+            output_path=output_path,
+            spreadsheet_title="Test Spreadsheet",
+        )
+
+        assert result is True
+        assert output_path.exists()
+
     @patch.object(GoogleDriveExporter, "_export_single_format")
     def test_export_spreadsheet_as_markdown_keeps_xlsx(self, mock_export, tmp_path, mock_markitdown):
         """Test that intermediate XLSX is kept when keep_intermediate_xlsx=True."""